@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+
+'''Python module for invoking REST calls from asyncio code and in bulk.'''
+
+# pylint: disable=broad-except
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from logger import CustomLogger
+from rest import REST
+
+
+LOG = CustomLogger(__name__)
+
+OPERATIONS = ('get', 'post', 'put', 'patch', 'delete')
+
+
+class BulkResult(list):
+    '''Results of a bulk call in call order; failed calls hold their error.'''
+
+    def __init__(self, results):
+        '''
+        Args:
+            :results (list): result or exception of every call, in order.
+        '''
+
+        super().__init__(results)
+        self.errors = {
+            index: result for index, result in enumerate(results)
+            if isinstance(result, Exception)
+        }
+
+    def raise_for_errors(self):
+        '''This routine raises the first collected error, if any.
+
+        Raises: Exception
+        '''
+
+        if self.errors:
+            raise self.errors[min(self.errors)]
+
+
+class AsyncREST(object):
+    '''Async REST class for invoking GET, POST, PUT, PATCH, DELETE calls.'''
+
+    def __init__(self, rest=None, concurrency=10, **kwargs):
+        '''This class defines coroutines to invoke REST calls.
+
+        Calls run on the pooled keep-alive sessions of a REST instance from a
+        bounded set of worker threads.
+
+        Args:
+            :rest (REST, optional): REST instance to run calls on. Default:
+                                    one built from kwargs.
+            :concurrency (int, optional): Max calls in flight. Default: 10.
+            :kwargs: REST arguments, used when rest is not given.
+
+        Returns:
+            Returns AsyncREST object instance.
+        '''
+
+        if rest is None:
+            kwargs.setdefault('pool_size', concurrency)
+            rest = REST(**kwargs)
+
+        self.rest = rest
+        self.concurrency = concurrency
+        self._executor = ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix='async-rest'
+        )
+
+    async def post(self, relative_url, **kwargs):
+        '''This routine is used to invoke POST call for REST API.
+
+        Args:
+            :relative_url(str): Relative URL for the particular API call.
+            :kwargs: same as REST.post.
+
+        Returns:
+            str: response text.
+        '''
+
+        return await self.__performOperation('post', relative_url, **kwargs)
+
+    async def get(self, relative_url, **kwargs):
+        '''This routine is used to invoke GET call for REST API.
+
+        Args:
+            :relative_url(str): Relative URL for the particular API call.
+            :kwargs: same as REST.get.
+
+        Returns:
+            str: response text.
+        '''
+
+        return await self.__performOperation('get', relative_url, **kwargs)
+
+    async def patch(self, relative_url, **kwargs):
+        '''This routine is used to invoke PATCH call for REST API.
+
+        Args:
+            :relative_url(str): Relative URL for the particular API call.
+            :kwargs: same as REST.patch.
+
+        Returns:
+            str: response text.
+        '''
+
+        return await self.__performOperation('patch', relative_url, **kwargs)
+
+    async def put(self, relative_url, **kwargs):
+        '''This routine is used to invoke PUT call for REST API.
+
+        Args:
+            :relative_url(str): Relative URL for the particular API call.
+            :kwargs: same as REST.put.
+
+        Returns:
+            str: response text.
+        '''
+
+        return await self.__performOperation('put', relative_url, **kwargs)
+
+    async def delete(self, relative_url, **kwargs):
+        '''This routine is used to invoke DELETE call for REST API.
+
+        Args:
+            :relative_url(str): Relative URL for the particular API call.
+            :kwargs: same as REST.delete.
+
+        Returns:
+            str: response text.
+        '''
+
+        return await self.__performOperation('delete', relative_url, **kwargs)
+
+    async def gather(self, calls, concurrency=None):
+        '''This routine issues many calls with at most <concurrency> in flight.
+
+        Args:
+            :calls (list): (operation, relative_url[, kwargs]) tuples, e.g.
+                           ('post', 'projects', {'payload': spec}).
+            :concurrency (int, optional): Max calls in flight, capped by the
+                                          instance concurrency.
+
+        Returns:
+            BulkResult: results in call order, errors collected per call.
+        '''
+
+        # the worker threads bound the calls in flight anyway
+        semaphore = asyncio.Semaphore(
+            min(concurrency or self.concurrency, self.concurrency)
+        )
+
+        async def _call(index, call):
+            operation, relative_url = call[0], call[1]
+            kwargs = dict(call[2]) if len(call) > 2 else {}
+            async with semaphore:
+                try:
+                    return await self.__performOperation(
+                        operation, relative_url, **kwargs
+                    )
+                except Exception as exception:
+                    LOG.error('bulk call {0} [{1}] {2} failed: {3}'.format(
+                        index, operation.upper(), relative_url, exception
+                    ))
+                    return exception
+
+        return BulkResult(await asyncio.gather(
+            *[_call(index, call) for index, call in enumerate(calls)]
+        ))
+
+    def bulk(self, calls, concurrency=None):
+        '''This routine runs gather() from synchronous code, e.g. fixtures.
+        It starts its own event loop, so coroutines that already run in one
+        await gather() instead.
+
+        Args:
+            :calls (list): see gather().
+            :concurrency (int, optional): see gather().
+
+        Returns:
+            BulkResult: results in call order, errors collected per call.
+
+        Raises: RuntimeError when called from a running event loop
+        '''
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.gather(calls, concurrency))
+
+        raise RuntimeError(
+            'bulk() can not run inside an event loop, await gather() instead'
+        )
+
+    def close(self):
+        '''This routine stops the worker threads.'''
+
+        self._executor.shutdown(wait=True)
+
+    async def __performOperation(self, operation, relative_url, **kwargs):
+        '''
+        Private Method running a REST operation on a worker thread.
+
+        Args:
+            :operation (str): one of get, post, put, patch, delete
+            :relative_url (str): Relative url
+
+        Returns:
+          str: Response text.
+
+        Raises: Exception
+        '''
+
+        if operation not in OPERATIONS:
+            raise ValueError('operation {} is invalid'.format(operation))
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(
+            getattr(self.rest, operation), relative_url, **kwargs
+        ))
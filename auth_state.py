@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+'''Python module that persists the authenticated browser state on disk'''
+
+# pylint: disable=broad-except
+
+import json
+import os
+import tempfile
+import threading
+import time
+
+import webdriver_pf as WD_PF
+from logger import CustomLogger
+
+
+LOG = CustomLogger(__name__)
+
+
+class AuthStateStore(object):
+    '''
+    File backed snapshots of the cookies, localStorage and sessionStorage of
+    logged in sessions, keyed by app url and username.
+
+    A snapshot expires after <ttl> secs or when the first of its cookies
+    does, whichever comes first. The file is replaced atomically so that
+    parallel workers only ever read complete snapshots.
+    '''
+
+    def __init__(self, path, ttl=1800):
+        '''
+        Args:
+            path (str): snapshot file
+            ttl (int): secs a snapshot is reused for
+        '''
+
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(url, username):
+        '''
+        Returns:
+            str: snapshot key of <username> on <url>
+        '''
+
+        return '{0}|{1}'.format(url.rstrip('/'), username)
+
+    def _read(self):
+        try:
+            with open(self.path) as infile:
+                return json.load(infile)
+        except (IOError, OSError, ValueError):
+            return {}
+
+    def _write(self, snapshots):
+        directory = os.path.dirname(self.path) or '.'
+        if not os.path.isdir(directory):
+            os.makedirs(directory, mode=0o700)
+        descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            # mkstemp creates the file with 0600 already
+            with os.fdopen(descriptor, 'w') as outfile:
+                json.dump(snapshots, outfile)
+            os.replace(temp_path, self.path)
+        except Exception:
+            os.unlink(temp_path)
+            raise
+
+    def load(self, url, username):
+        '''
+        Returns the unexpired snapshot of <username> on <url>
+        Args:
+            url (str): app url
+            username (str): logged in user
+        Returns:
+            dict: cookies, local and session storage, None if missing
+        '''
+
+        snapshot = self._read().get(self.key(url, username))
+        if snapshot is None or snapshot['expires'] <= time.time():
+            return None
+        return snapshot
+
+    def save(self, url, username, snapshot):
+        '''
+        Stores <snapshot>, dropping expired snapshots of other keys
+        Args:
+            url (str): app url
+            username (str): logged in user
+            snapshot (dict): as returned by capture()
+        '''
+
+        now = time.time()
+        with self._lock:
+            snapshots = {
+                key: value for key, value in self._read().items()
+                if value.get('expires', 0) > now
+            }
+            snapshots[self.key(url, username)] = snapshot
+            try:
+                self._write(snapshots)
+            except Exception as exception:
+                LOG.warning('failed to save auth state: {}'.format(exception))
+
+    def discard(self, url, username):
+        '''
+        Drops the snapshot of <username> on <url>, e.g. once it got rejected
+        '''
+
+        with self._lock:
+            snapshots = self._read()
+            if snapshots.pop(self.key(url, username), None) is not None:
+                try:
+                    self._write(snapshots)
+                except Exception as exception:
+                    LOG.warning('failed to discard auth state: {}'.format(
+                        exception
+                    ))
+
+    def capture(self, driver):
+        '''
+        Snapshots the auth state of the page loaded in <driver>
+        Args:
+            driver (WebDriver): logged in driver
+        Returns:
+            dict: cookies, local and session storage with their expiry
+        '''
+
+        cookies = driver.get_cookies()
+        storage = driver.execute_script(WD_PF.JS.STORAGE_SNAPSHOT)
+        expires = time.time() + self.ttl
+        for cookie in cookies:
+            if 'expiry' in cookie:
+                expires = min(expires, cookie['expiry'])
+
+        return {
+            'cookies': cookies,
+            'local': storage['local'],
+            'session': storage['session'],
+            'expires': expires,
+        }
+
+    @staticmethod
+    def restore(driver, snapshot):
+        '''
+        Loads <snapshot> into the current origin of <driver>; the page has
+        to be reloaded for the app to pick it up
+        Args:
+            driver (WebDriver): driver on the app origin
+            snapshot (dict): as returned by capture()
+        '''
+
+        for cookie in snapshot['cookies']:
+            try:
+                driver.add_cookie(cookie)
+            except Exception as exception:
+                LOG.debug('skipping cookie {0}: {1}'.format(
+                    cookie.get('name'), exception
+                ))
+        driver.execute_script(
+            WD_PF.JS.STORAGE_RESTORE, snapshot['local'], snapshot['session']
+        )
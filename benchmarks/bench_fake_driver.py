@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+'''
+Micro-benchmarks the pure python overhead of the webdriver helpers against
+the in-process fake driver, no browser needed.
+
+    python benchmarks/bench_fake_driver.py --runs 1000 [--compare results/x.json]
+'''
+
+import argparse
+
+from common import compare, run_case, write_results
+
+
+def cases(selenium, dom):
+    '''
+    Args:
+        selenium (Selenium): session attached to a FakeDriver
+        dom (FakeDOM): page model of the driver
+    Returns:
+        dict: case name to (operation, reset) callables
+    '''
+
+    from selenium.webdriver.common.by import By
+    from fake_webdriver import FakeElement
+
+    button = (By.ID, 'save')
+    name = (By.ID, 'name')
+    label = (By.ID, 'label')
+    missing = (By.ID, 'missing')
+
+    dom.add(button, FakeElement('button', text='Save'))
+    dom.add(name, FakeElement('input'))
+    dom.add(label, FakeElement('span', text='Ready', attributes={'class': 'n-label'}))
+
+    def replace_label():
+        # detaches the cached element so the next read relocates it
+        for element in dom.find(*label):
+            dom.remove(element)
+        dom.add(label, FakeElement('span', text='Ready'))
+
+    return {
+        'button': (lambda: selenium.button(button), None),
+        'textbox': (lambda: selenium.textbox('benchmark entity', name), None),
+        'get_text': (lambda: selenium.get_text(label), None),
+        'get_attribute': (lambda: selenium.get_attribute('class', label), None),
+        'get_text_stale': (lambda: selenium.get_text(label), replace_label),
+        'is_element_present': (lambda: selenium.is_element_present(button), None),
+        'is_element_absent': (lambda: selenium.is_element_absent(missing), None),
+        'is_visible': (lambda: selenium.is_visible(button), None),
+        'wait_until_element_present': (
+            lambda: selenium.wait_until_element_present(button, 1), None
+        ),
+        'wait_until_element_not_present': (
+            lambda: selenium.wait_until_element_not_present(missing, 1), None
+        ),
+    }
+
+
+def main():
+    '''runs the benchmark cases and writes the json results'''
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=1000)
+    parser.add_argument('--case', action='append', dest='cases',
+                        help='run only this case, may be repeated')
+    parser.add_argument('--output', help='results file to write')
+    parser.add_argument('--compare', help='results file to compare against')
+    args = parser.parse_args()
+
+    from fake_webdriver import FakeDOM, FakeDriver
+    from webdriver import Selenium
+
+    dom = FakeDOM()
+    selenium = Selenium.new_instance(driver=FakeDriver(dom), login=False)
+    results = {}
+    for name, (operation, reset) in cases(selenium, dom).items():
+        if args.cases and name not in args.cases:
+            continue
+        results[name] = run_case(operation, args.runs, reset)
+        print('{0:<32} median {1:.2f}us  p95 {2:.2f}us  {3} commands'.format(
+            name, results[name]['median'] * 1e6, results[name]['p95'] * 1e6,
+            results[name]['commands']
+        ))
+
+    print('results written to {}'.format(
+        write_results('fake-driver', results, args.output)
+    ))
+    if args.compare:
+        print(compare(results, args.compare))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+'''
+Benchmarks the webdriver helpers under headless Chrome against the local
+fixture app in benchmarks/app, no live product or network needed.
+
+    python benchmarks/bench_helpers.py --runs 10 [--compare results/x.json]
+'''
+
+import argparse
+import functools
+import http.server
+import os
+import threading
+
+from common import BENCH_DIR, compare, run_case, write_results
+
+APP_DIR = os.path.join(BENCH_DIR, 'app')
+
+# ~20 KB script typed into the CodeMirror stand-in
+SCRIPT = '\n'.join(
+    'echo "line {0} of the benchmark script"'.format(i) for i in range(500)
+)
+
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    '''static file handler that does not log every request'''
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+def serve_app():
+    '''
+    serves the fixture app on a free local port from a daemon thread
+    Returns:
+        ThreadingHTTPServer: running server
+    '''
+
+    handler = functools.partial(_QuietHandler, directory=APP_DIR)
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def cases(selenium):
+    '''
+    Args:
+        selenium (Selenium): logged in session on the fixture app
+    Returns:
+        dict: case name to (operation, reset) callables
+    '''
+
+    from selenium.webdriver.common.by import By
+    import webdriver_pf as WD_PF
+
+    def reset():
+        selenium.driver.execute_script('window.benchReset();')
+
+    def logout():
+        selenium.driver.execute_script('window.benchLogout();')
+
+    return {
+        'button': (
+            lambda: selenium.button((By.ID, 'bench-button')), reset
+        ),
+        'textbox': (
+            lambda: selenium.textbox('benchmark entity', (By.ID, 'entity-name')),
+            reset
+        ),
+        'select': (
+            lambda: selenium.select('Project', 'Project 3'), reset
+        ),
+        'select_by_search': (
+            lambda: selenium.select_by_search('Environment', 'env 27'), reset
+        ),
+        'fill_form': (
+            lambda: selenium.fill_form({
+                (By.ID, 'entity-name'): 'benchmark entity',
+                (By.ID, 'entity-description'): 'created by the benchmark',
+                'Project': 'Project 3',
+            }),
+            reset
+        ),
+        'get_all_options': (
+            lambda: selenium.get_all_options('Owner'), reset
+        ),
+        'scroll_from_top': (
+            lambda: selenium.scroll_from_top((By.ID, 'bottom-button'), timeout=60),
+            reset
+        ),
+        'toggle_password': (
+            lambda: selenium.toggle_password(True),
+            lambda: selenium.driver.execute_script(
+                "arguments[0].type = 'password';",
+                selenium.driver.find_element(*WD_PF.SELENIUM.SHOW_PASSWORD_INPUT)
+            )
+        ),
+        'expand_section': (
+            lambda: selenium.expand_section('Advanced Options'),
+            lambda: selenium.driver.execute_script(
+                "document.querySelector('.section-arrow')"
+                ".classList.remove('arrow-down');"
+            )
+        ),
+        'script_text': (
+            lambda: selenium.script_text((By.ID, 'editor'), SCRIPT), None
+        ),
+        'login': (selenium.login, logout),
+    }
+
+
+def main():
+    '''runs the benchmark cases and writes the json results'''
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--case', action='append', dest='cases',
+                        help='run only this case, may be repeated')
+    parser.add_argument('--output', help='results file to write')
+    parser.add_argument('--compare', help='results file to compare against')
+    args = parser.parse_args()
+
+    server = serve_app()
+    os.environ.setdefault('browser', 'chrome')
+    os.environ['APP_URL'] = 'http://127.0.0.1:{}/index.html'.format(
+        server.server_address[1]
+    )
+
+    from webdriver import Selenium
+
+    selenium = Selenium.new_instance()
+    results = {}
+    try:
+        for name, (operation, reset) in cases(selenium).items():
+            if args.cases and name not in args.cases:
+                continue
+            results[name] = run_case(operation, args.runs, reset)
+            print('{0:<20} median {1:.4f}s  p95 {2:.4f}s  {3} commands'.format(
+                name, results[name]['median'], results[name]['p95'],
+                results[name]['commands']
+            ))
+    finally:
+        selenium.driver.quit()
+        server.shutdown()
+
+    print('results written to {}'.format(
+        write_results('helpers', results, args.output)
+    ))
+    if args.compare:
+        print(compare(results, args.compare))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+'''Timing, result file and comparison utils shared by the benchmarks'''
+
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import command_counter  # pylint: disable=wrong-import-position
+
+
+def percentile(values, pct):
+    '''
+    Args:
+        values (list): measured values
+        pct (float): percentile between 0 and 100
+    Returns:
+        float: nearest rank percentile
+    '''
+
+    ordered = sorted(values)
+    index = max(0, int(round(pct / 100.0 * len(ordered))) - 1)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+def run_case(func, runs, reset=None):
+    '''
+    times <func> <runs> times, calling <reset> untimed before every run
+    Args:
+        func (callable): benchmarked operation
+        runs (int): number of timed runs
+        reset (callable): restores the state func expects
+    Returns:
+        dict: runs, mean, median, p95, min, max in secs and webdriver
+              commands per run
+    '''
+
+    timings = []
+    commands = []
+    for _ in range(runs):
+        if reset is not None:
+            reset()
+        before = command_counter.COMMANDS.total
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+        commands.append(command_counter.COMMANDS.total - before)
+
+    return {
+        'runs': runs,
+        'mean': round(statistics.mean(timings), 6),
+        'median': round(statistics.median(timings), 6),
+        'p95': round(percentile(timings, 95), 6),
+        'min': round(min(timings), 6),
+        'max': round(max(timings), 6),
+        'commands': round(statistics.mean(commands), 2),
+    }
+
+
+def git_commit():
+    '''
+    Returns:
+        str: short hash of HEAD with a -dirty suffix for local changes
+    '''
+
+    try:
+        commit = subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+            stderr=subprocess.DEVNULL
+        ).decode().strip()
+        dirty = subprocess.check_output(
+            ['git', 'status', '--porcelain', '--untracked-files=no'],
+            cwd=ROOT_DIR, stderr=subprocess.DEVNULL
+        ).strip()
+        return commit + ('-dirty' if dirty else '')
+    except Exception:  # pylint: disable=broad-except
+        return 'unknown'
+
+
+def write_results(suite, results, path=None):
+    '''
+    writes results to <path>, default results/<suite>-<commit>.json
+    Args:
+        suite (str): benchmark suite name
+        results (dict): case name to run_case() result
+        path (str): output file
+    Returns:
+        str: path written
+    '''
+
+    commit = git_commit()
+    if path is None:
+        if not os.path.isdir(RESULTS_DIR):
+            os.makedirs(RESULTS_DIR)
+        path = os.path.join(RESULTS_DIR, '{0}-{1}.json'.format(suite, commit))
+
+    document = {
+        'suite': suite,
+        'commit': commit,
+        'timestamp': datetime.datetime.now(
+            datetime.timezone.utc
+        ).isoformat().replace('+00:00', 'Z'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    with open(path, 'w') as outfile:
+        json.dump(document, outfile, indent=4, sort_keys=True)
+    return path
+
+
+def compare(results, baseline_path):
+    '''
+    renders the median change of every case against a baseline file
+    Args:
+        results (dict): case name to run_case() result
+        baseline_path (str): results file of an earlier run
+    Returns:
+        str: comparison table
+    '''
+
+    with open(baseline_path) as infile:
+        baseline = json.load(infile)
+
+    lines = ['{0:<24} {1:>12} {2:>12} {3:>9} {4:>10}'.format(
+        'case', 'baseline', 'current', 'change', 'commands'
+    )]
+    for name, result in sorted(results.items()):
+        old = baseline['results'].get(name)
+        if old is None:
+            lines.append('{0:<24} {1:>12} {2:>12.4f}'.format(
+                name, '-', result['median']
+            ))
+            continue
+        change = (result['median'] - old['median']) / old['median'] * 100 \
+            if old['median'] else 0.0
+        lines.append('{0:<24} {1:>12.4f} {2:>12.4f} {3:>+8.1f}% {4:>4}->{5}'.format(
+            name, old['median'], result['median'], change,
+            old.get('commands', '-'), result['commands']
+        ))
+    return '\n'.join(lines)
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+'''Counts and times WebDriver commands sent to the browser'''
+
+import collections
+import threading
+import time
+
+import instrumentation
+
+
+class CommandCounter(object):
+    '''
+    WebDriver command statistics by command name, test and helper.
+
+    Helpers are only told apart when helper instrumentation is enabled
+    (HELPER_METRICS=1), otherwise their commands are reported as <untracked>.
+    '''
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.total = 0
+        self.commands = collections.Counter()
+        self.times = collections.defaultdict(float)
+        self.helpers = collections.Counter()
+        self.tests = collections.Counter()
+        self.test = None
+
+    def record(self, command, elapsed):
+        '''
+        records one command round trip
+        Args:
+            command (str): WebDriver command name
+            elapsed (float): round trip in secs
+        '''
+
+        helper = instrumentation.METRICS.current_helper() or '<untracked>'
+        with self._lock:
+            self.total += 1
+            self.commands[command] += 1
+            self.times[command] += elapsed
+            self.helpers[helper] += 1
+            if self.test is not None:
+                self.tests[self.test] += 1
+
+    def start_test(self, nodeid):
+        '''
+        attributes following commands to test <nodeid>
+        Args:
+            nodeid (str): pytest node id
+        '''
+
+        with self._lock:
+            self.test = nodeid
+            self.tests[nodeid] += 0
+
+    def end_test(self):
+        '''
+        Returns:
+            int: commands sent during the test just ended
+        '''
+
+        with self._lock:
+            nodeid, self.test = self.test, None
+            return self.tests[nodeid] if nodeid is not None else 0
+
+    def report(self, top=10):
+        '''
+        Args:
+            top (int): number of entries per ranking
+        Returns:
+            dict: totals, per command counts and times, chattiest tests and
+                  helpers
+        '''
+
+        with self._lock:
+            return {
+                'total': self.total,
+                'commands': {
+                    command: {'count': count,
+                              'time': round(self.times[command], 4)}
+                    for command, count in self.commands.most_common()
+                },
+                'chattiest_tests': self.tests.most_common(top),
+                'chattiest_helpers': self.helpers.most_common(top),
+            }
+
+
+COMMANDS = CommandCounter()
+
+
+class CountingCommandExecutor(object):
+    '''wraps a driver command_executor, recording every command it sends'''
+
+    def __init__(self, executor, counter=COMMANDS):
+        '''
+        Args:
+            executor (RemoteConnection): executor of the driver
+            counter (CommandCounter): statistics to record into
+        '''
+
+        self._executor = executor
+        self._counter = counter
+        # commands sent by this driver alone
+        self.total = 0
+
+    def execute(self, command, params):
+        '''
+        sends <command> through the wrapped executor and records it
+        '''
+
+        start = time.perf_counter()
+        try:
+            return self._executor.execute(command, params)
+        finally:
+            self.total += 1
+            self._counter.record(command, time.perf_counter() - start)
+
+    def __getattr__(self, name):
+        return getattr(self._executor, name)
+
+
+def install(driver, counter=COMMANDS):
+    '''
+    makes <driver> send its commands through a CountingCommandExecutor
+    Args:
+        driver (WebDriver): driver to wrap
+        counter (CommandCounter): statistics to record into
+    '''
+
+    if not isinstance(driver.command_executor, CountingCommandExecutor):
+        driver.command_executor = CountingCommandExecutor(
+            driver.command_executor, counter
+        )
+
+
+def sent(driver):
+    '''
+    Args:
+        driver (WebDriver): driver set up with install()
+    Returns:
+        int: commands <driver> sent since install(), 0 if not installed
+    '''
+
+    return getattr(driver.command_executor, 'total', 0) \
+        if isinstance(driver.command_executor, CountingCommandExecutor) else 0
+
+
+def format_report(report):
+    '''
+    renders a report as a short multi line text
+    Args:
+        report (dict): CommandCounter report
+    Returns:
+        str: report
+    '''
+
+    lines = ['webdriver commands: {}'.format(report['total'])]
+    for command, stats in report['commands'].items():
+        lines.append('  {0:<32} n={1:<7} time={2}s'.format(
+            command, stats['count'], stats['time']
+        ))
+    lines.append('  chattiest tests:')
+    lines.extend('    {1:<7} {0}'.format(*item)
+                 for item in report['chattiest_tests'])
+    lines.append('  chattiest helpers:')
+    lines.extend('    {1:<7} {0}'.format(*item)
+                 for item in report['chattiest_helpers'])
+    return '\n'.join(lines)
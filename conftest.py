@@ -17,7 +17,11 @@ import json
 
 #from pytest_reportportal import RPLogger, RPLogHandler
 
-from logger import CustomLogger
+from async_rest import AsyncREST
+import command_counter
+from driver_pool import DriverPool
+import instrumentation
+from logger import CustomLogger, shutdown_logging
 from webdriver import Selenium
 from constants import CREDS
 from rest import REST
@@ -25,10 +29,62 @@ from rest import REST
 LOG = CustomLogger(__name__)
 selenium = None
 
+def pytest_runtest_setup(item):
+    '''
+    opens the helper metrics scope of a test
+    '''
+    if instrumentation.ENABLED:
+        instrumentation.METRICS.start_test(item.nodeid)
+
+
+def pytest_runtest_logfinish(nodeid, location):
+    '''
+    logs the helper metrics of a finished test
+    '''
+    if instrumentation.ENABLED:
+        summary = instrumentation.METRICS.end_test()
+        if summary is not None:
+            LOG.info(instrumentation.format_summary(summary))
+
+
+def pytest_sessionfinish(session, exitstatus):
+    '''
+    reports session helper metrics and flushes queued log records once the
+    session is over
+    '''
+    if instrumentation.ENABLED:
+        LOG.info(instrumentation.format_summary(
+            instrumentation.METRICS.session_summary()
+        ))
+        if instrumentation.METRICS_FILE:
+            instrumentation.METRICS.write(instrumentation.METRICS_FILE)
+    LOG.info(command_counter.format_report(command_counter.COMMANDS.report()))
+    shutdown_logging()
+
+
+@pytest.fixture(scope='session')
+def driver_pool(request):
+    '''
+    starts the browser session pool, sized by env DRIVER_POOL_SIZE
+    (default 1, i.e. one browser per worker, or 2 if a collected test uses
+    pooled_selenium next to the session wide browser)
+    '''
+    pooled = any(
+        'pooled_selenium' in getattr(item, 'fixturenames', ())
+        for item in request.session.items
+    )
+    size = int(os.getenv('DRIVER_POOL_SIZE', 2 if pooled else 1))
+    pool = DriverPool(Selenium, size=size)
+    yield pool
+    pool.close()
+
+
 @pytest.fixture(scope='session', autouse=True)
-def start_browser_and_login_as_admin():
+def start_browser_and_login_as_admin(driver_pool):
     global selenium
-    selenium = Selenium()
+    selenium = driver_pool.acquire()
+    # keep legacy Selenium() callers on the session used by the fixtures
+    Selenium.set_instance(selenium)
     yield
     try:
         LOG.info("executing yield")
@@ -44,11 +100,26 @@ def start_browser_and_login_as_admin():
             LOG.info("Coverage Report File - {}".format(file_name))
             with open(os.path.join(coverage_dir, file_name), 'w') as outfile:
                 json.dump(js, outfile)
-        selenium.driver.quit()
-        selenium.display.stop()
+        driver_pool.release(selenium)
     except Exception:
         pass
 
+
+@pytest.fixture(scope='function')
+def pooled_selenium(driver_pool):
+    '''
+    lends a dedicated browser session to a test; needs DRIVER_POOL_SIZE > 1
+    Returns:
+        Selenium (object) : Selenium instance borrowed from the pool.
+    '''
+    if driver_pool.size < 2:
+        pytest.fail(
+            'pooled_selenium needs DRIVER_POOL_SIZE >= 2, the only session '
+            'is held by the session wide browser', pytrace=False
+        )
+    with driver_pool.lease() as session:
+        yield session
+
 """
 @pytest.fixture(scope="session", autouse=True)
 def rp_logger(request):
@@ -80,6 +151,67 @@ def get_into_app_for_test_method():
     load_apps_page()
 
 
+@pytest.fixture(scope='function', autouse=True)
+def driver_command_budget(request, get_into_app_for_test_method):
+    '''
+    attributes the WebDriver commands sent during a test to it in the
+    command report
+    '''
+    command_counter.COMMANDS.start_test(request.node.nodeid)
+    yield
+    command_counter.COMMANDS.end_test()
+
+
+def _test_drivers(item):
+    '''
+    drivers of the sessions a test runs on: the session wide one and the
+    ones it borrowed from the pool
+    '''
+    sessions = [selenium] + [
+        value for value in getattr(item, 'funcargs', {}).values()
+        if isinstance(value, Selenium)
+    ]
+    drivers = []
+    for session in sessions:
+        if session is not None and \
+                all(session.driver is not driver for driver in drivers):
+            drivers.append(session.driver)
+    return drivers
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    '''
+    counts the WebDriver commands the test body sends through its own
+    sessions, for the budget set with utils.max_driver_commands
+    '''
+    drivers = _test_drivers(item)
+    before = [command_counter.sent(driver) for driver in drivers]
+    yield
+    item.driver_commands = sum(
+        command_counter.sent(driver) - count
+        for driver, count in zip(drivers, before)
+    )
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    '''
+    fails a test that passed but sent more WebDriver commands than its
+    budget
+    '''
+    outcome = yield
+    report = outcome.get_result()
+    limit = getattr(getattr(item, 'function', None), 'max_driver_commands',
+                    None)
+    used = getattr(item, 'driver_commands', None)
+    if call.when == 'call' and report.passed and limit is not None and \
+            used is not None and used > limit:
+        report.outcome = 'failed'
+        report.longrepr = '{0} sent {1} webdriver commands, budget is ' \
+            '{2}'.format(item.nodeid, used, limit)
+
+
 @pytest.fixture(scope='class', autouse=True)
 def get_into_application_page_for_test_class():
     load_apps_page()
@@ -91,6 +223,10 @@ def load_apps_page():
     '''
     LOG.debug("running load /apps page fixture")
     #selenium = Selenium()
+    if selenium.navigation.is_clean():
+        LOG.info("page left clean, skipping reload")
+        return
+
     current_url = selenium.driver.current_url
     pattern = '.*[0-9]/apps/$'
 
@@ -98,7 +234,8 @@ def load_apps_page():
     if bool(re.match(pattern, current_url)):
         LOG.info("page already in /apps page")
     elif 'login' in current_url:
-        selenium.login()
+        if not selenium.resume_session():
+            selenium.login()
     else:
         selenium.load_application_page()
 
@@ -119,3 +256,15 @@ def rest():
         kwargs['ip'], port
     )
     return REST(**kwargs)
+
+
+@pytest.fixture(scope='class')
+def async_rest(rest):
+    """
+    async/bulk client running on the rest fixture's connection pool
+    Returns:
+        AsyncREST (object) : AsyncREST object instance.
+    """
+    client = AsyncREST(rest=rest, concurrency=rest.pool_size)
+    yield client
+    client.close()
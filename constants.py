@@ -31,3 +31,54 @@ class UI_SCROLL_POSITIONING:
     BOTTOM_LEFT = "bottom_left"
     BOTTOM_CENTER = "bottom_center"
     BOTTOM_RIGHT = "bottom_right"
+
+class SETTLE:
+    # secs the page has to stay free of DOM mutations and pending requests
+    QUIET_WINDOW = 0.3
+    # upper cap in secs, must stay below the driver script timeout
+    TIMEOUT = 5
+    # secs after which a pending request is taken for a long poll or a stream
+    # and no longer waited on
+    REQUEST_CUTOFF = 10
+
+class AUTH_STATE:
+    # reuse the cookies and web storage of an earlier login instead of the UI
+    # login, off unless AUTH_STATE=1 since it writes session cookies to disk
+    ENABLED = os.getenv('AUTH_STATE', '0') == '1'
+    # snapshot file, readable by the owner only since it holds session cookies
+    PATH = os.getenv('AUTH_STATE_FILE') or os.path.join(
+        os.path.expanduser('~'), '.cache', 'selenium_helpers', 'auth_state.json'
+    )
+    # secs a snapshot is reused for, capped by the expiry of its cookies
+    TTL = int(os.getenv('AUTH_STATE_TTL', 1800))
+
+class LOGIN:
+    # 'ui' types the credentials, 'rest' injects the session cookies of a REST
+    # login into the browser before the first page load
+    MODE = os.getenv('LOGIN_MODE', 'ui')
+    # relative url authenticated with basic auth to obtain the session cookies
+    REST_URL = 'users/me'
+    # secs to wait for the app to accept injected or restored credentials
+    VERIFY_TIMEOUT = 30
+
+class POLLING:
+    # secs between the first polls of a wait
+    INITIAL = 0.05
+    # polls at INITIAL before backing off
+    FAST_POLLS = 5
+    # growth of the interval per poll once backing off
+    BACKOFF = 1.5
+    # upper cap of the interval in secs
+    MAX_INTERVAL = 2
+
+class DOM_WAIT:
+    # wait for elements inside the page instead of polling from python
+    ENABLED = os.getenv('DOM_WAIT', '1') != '0'
+    # secs one in-page wait may block, must stay below the driver script timeout
+    SLICE = 8
+
+class FAST_INPUT:
+    # textbox inserts text of this many chars or more through devtools instead of typing it
+    THRESHOLD = int(os.getenv('FAST_INPUT_THRESHOLD', '200'))
+    # chars per script call when transferring code into CodeMirror
+    CHUNK_SIZE = 256 * 1024
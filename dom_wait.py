@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+'''Python module that waits for element conditions inside the page'''
+
+# pylint: disable=broad-except
+
+import contextlib
+import time
+
+from selenium.common.exceptions import NoSuchElementException, \
+    StaleElementReferenceException, TimeoutException, WebDriverException
+from selenium.webdriver.support import expected_conditions as EC
+
+import constants
+import polling
+import webdriver_pf as WD_PF
+from logger import CustomLogger
+
+
+LOG = CustomLogger(__name__)
+
+# conditions a check can wait for, with their python evaluation
+CONDITIONS = {
+    'present': lambda locator, _: EC.presence_of_element_located(locator),
+    'absent': lambda locator, _: lambda driver: not driver.find_elements(
+        *locator
+    ),
+    'visible': lambda locator, _: EC.visibility_of_element_located(locator),
+    'invisible': lambda locator, _: EC.invisibility_of_element_located(
+        locator
+    ),
+    'clickable': lambda locator, _: EC.element_to_be_clickable(locator),
+    'text': EC.text_to_be_present_in_element,
+}
+
+
+class DomWait(object):
+    '''
+    Waits for (locator, condition[, text]) checks to hold.
+
+    The checks are evaluated inside the page by an async script that
+    re-evaluates them on DOM mutations, once per animation frame at most,
+    and resolves as soon as they hold: one round trip per wait slice
+    instead of one per poll. Waits longer than DOM_WAIT.SLICE run in several
+    slices. If the page can not run the script, e.g. it navigates away,
+    the rest of the wait polls from python on a PollingPolicy.
+    '''
+
+    def __init__(self, driver, timeout, policy=None, in_page=None,
+                 polling_scope=None):
+        '''
+        Args:
+            driver (WebDriver): driver of the page
+            timeout (float): secs until TimeoutException
+            policy (PollingPolicy): poll intervals of the python fallback
+            in_page (bool): evaluate in the page, Default: DOM_WAIT.ENABLED
+            polling_scope (callable): returns a context manager the python
+                                      fallback runs in, e.g. one lifting
+                                      the implicit wait
+        '''
+
+        self._driver = driver
+        self._timeout = timeout
+        self._policy = policy
+        self._polling_scope = polling_scope or contextlib.nullcontext
+        self._in_page = constants.DOM_WAIT.ENABLED if in_page is None \
+            else in_page
+
+    @staticmethod
+    def _encode(checks):
+        encoded = []
+        for check in checks:
+            locator, condition = check[0], check[1]
+            if condition not in CONDITIONS:
+                raise ValueError('unknown condition {}'.format(condition))
+            text = check[2] if len(check) > 2 else None
+            encoded.append([locator[0], locator[1], condition, text])
+        return encoded
+
+    def until(self, checks, mode='any', message=''):
+        '''
+        Waits for any or all of <checks> to hold
+        Args:
+            checks (list): (locator, condition[, text]) tuples, condition
+                           being a key of CONDITIONS
+            mode (str): 'any' or 'all'
+            message (str): message of the TimeoutException
+        Returns:
+            list: per check the matched element, True or False
+        Raises:
+            TimeoutException: if they do not hold within the timeout
+        '''
+
+        encoded = self._encode(checks)
+        end = time.monotonic() + self._timeout
+
+        while self._in_page:
+            remaining = max(0, end - time.monotonic())
+            try:
+                state = self._driver.execute_async_script(
+                    WD_PF.JS.WAIT_FOR, encoded, mode,
+                    int(min(remaining, constants.DOM_WAIT.SLICE) * 1000)
+                )
+            except WebDriverException as exception:
+                LOG.debug('in-page wait failed, polling instead: {}'.format(
+                    exception
+                ))
+                break
+
+            if state['done']:
+                return state['results']
+            if time.monotonic() >= end:
+                raise TimeoutException(message)
+
+        with self._polling_scope():
+            return polling.PolicyWait(
+                self._driver, max(0, end - time.monotonic()), self._policy
+            ).until(
+                lambda driver: self.evaluate(driver, encoded, mode), message
+            )
+
+    @staticmethod
+    def evaluate(driver, encoded, mode):
+        '''
+        evaluates encoded checks from python, one round trip per check
+        Returns:
+            list: results if any / all checks hold, else None
+        '''
+
+        results = []
+        for by, value, condition, text in encoded:
+            try:
+                result = CONDITIONS[condition]((by, value), text)(driver)
+            except (NoSuchElementException, StaleElementReferenceException):
+                result = False
+            results.append(result)
+
+        met = len([result for result in results if result])
+        done = met == len(results) if mode == 'all' else met > 0
+        return results if done else None
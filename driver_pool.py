@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+'''Python module that lends browser sessions out of a fixed size pool'''
+
+# pylint: disable=broad-except
+
+import contextlib
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from logger import CustomLogger
+
+
+LOG = CustomLogger(__name__)
+
+
+class DriverPool(object):
+    '''
+    Pool of browser sessions.
+
+    Sessions are started up front, lent out with acquire()/lease() and
+    health checked when they are given back. A session whose browser does
+    not answer any more is quit and replaced by a fresh one.
+    '''
+
+    def __init__(self, factory, size=None, acquire_timeout=600):
+        '''
+        Starts <size> browser sessions
+
+        Args:
+            factory (class): Singleton driver class, e.g. webdriver.Selenium
+            size (int, optional): number of sessions. Default: env
+                                  DRIVER_POOL_SIZE or number of cpus
+            acquire_timeout (int): secs to wait for a free session
+        '''
+
+        if size is None:
+            size = int(os.getenv('DRIVER_POOL_SIZE', os.cpu_count() or 1))
+        if size < 1:
+            raise ValueError('pool size {} is invalid'.format(size))
+
+        self.factory = factory
+        self.size = size
+        self.acquire_timeout = acquire_timeout
+        self._idle = queue.Queue()
+        self._sessions = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+        LOG.info('starting {} browser session(s)'.format(size))
+        with ThreadPoolExecutor(max_workers=size) as executor:
+            futures = [
+                executor.submit(self._new_session) for _ in range(size)
+            ]
+
+        sessions, failure = [], None
+        for future in futures:
+            try:
+                sessions.append(future.result())
+            except Exception as exception:
+                failure = failure or exception
+
+        if failure is not None:
+            # do not leak the browsers that did start
+            for session in sessions:
+                self._quit(session)
+            raise failure
+
+        for session in sessions:
+            self._sessions.append(session)
+            self._idle.put(session)
+
+    def _new_session(self):
+        '''
+        builds a new, non singleton session from the factory
+
+        Returns:
+            object: factory instance
+        '''
+
+        return self.factory.new_instance()
+
+    def acquire(self, timeout=None):
+        '''
+        Borrows a session from the pool
+
+        Args:
+            timeout (int, optional): secs to wait for a free session
+        Returns:
+            object: factory instance
+        Raises:
+            RuntimeError: if the pool is closed or exhausted
+        '''
+
+        if self._closed:
+            raise RuntimeError('driver pool is closed')
+
+        if timeout is None:
+            timeout = self.acquire_timeout
+
+        try:
+            session = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise RuntimeError(
+                'no free browser session within {} secs'.format(timeout)
+            )
+
+        if session is not None:
+            return session
+
+        # the slot lost its session to a failed recycle, refill it
+        try:
+            session = self._new_session()
+        except Exception:
+            self._idle.put(None)
+            raise
+        with self._lock:
+            self._sessions.append(session)
+        return session
+
+    def release(self, session):
+        '''
+        Gives a session back, recycling it if its browser is broken
+
+        Args:
+            session (object): session returned by acquire()
+        '''
+
+        if self._closed:
+            self._quit(session)
+            return
+
+        try:
+            if not self.is_healthy(session):
+                LOG.warning('recycling unhealthy browser session')
+                session = self._recycle(session)
+        except Exception as exception:
+            # keep the slot, acquire() starts a session for it
+            LOG.error('failed to recycle browser session: {}'.format(
+                exception
+            ))
+            session = None
+        finally:
+            self._idle.put(session)
+
+    @contextlib.contextmanager
+    def lease(self, timeout=None):
+        '''
+        Context manager around acquire()/release()
+
+        Args:
+            timeout (int, optional): secs to wait for a free session
+        '''
+
+        session = self.acquire(timeout)
+        try:
+            yield session
+        finally:
+            self.release(session)
+
+    def is_healthy(self, session):
+        '''
+        Checks whether the browser of <session> still answers
+
+        Args:
+            session (object): pooled session
+        Returns:
+            bool: True if the browser responded
+        '''
+
+        try:
+            session.driver.execute_script('return document.readyState;')
+            return True
+        except Exception as exception:
+            LOG.warning('browser health check failed: {}'.format(exception))
+            return False
+
+    def _recycle(self, session):
+        '''
+        Replaces a broken session by a new one
+
+        Args:
+            session (object): pooled session to be replaced
+        Returns:
+            object: new session
+        '''
+
+        self._quit(session)
+        with self._lock:
+            self._sessions = [
+                item for item in self._sessions if item is not session
+            ]
+        new_session = self._new_session()
+        with self._lock:
+            self._sessions.append(new_session)
+        return new_session
+
+    def _quit(self, session):
+        '''
+        Quits the browser and display of <session>, ignoring failures
+
+        Args:
+            session (object): pooled session
+        '''
+
+        try:
+            session.driver.quit()
+        except Exception:
+            pass
+
+        try:
+            if session.display is not None:
+                session.display.stop()
+        except Exception:
+            pass
+
+    def close(self):
+        '''
+        Quits every session owned by the pool
+        '''
+
+        self._closed = True
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+
+        for session in sessions:
+            self._quit(session)
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+'''Python module that caches located web elements of the loaded page'''
+
+import contextlib
+
+
+class ElementCache(object):
+    '''
+    Locator keyed cache of web elements for the currently loaded page.
+
+    Elements are only kept within a scope(), i.e. for one helper chain, and
+    are dropped when the outermost scope ends: a re-render that keeps the
+    old node in the DOM, or a raw driver call, can make a cached element
+    stop matching its locator without it going stale. Entries are also
+    dropped on navigation and after any helper that acts on the page; stale
+    entries are relocated by the caller.
+
+    Only toggle_checkbox and toggle_runtime open a scope, so every other
+    helper locates its element afresh; wrap a chain of helpers on the same
+    locators in scope() to share the lookups.
+    '''
+
+    def __init__(self):
+        '''
+        constructor for element cache
+        '''
+
+        self._elements = {}
+        self._depth = 0
+
+    @contextlib.contextmanager
+    def scope(self):
+        '''
+        Caches located elements until the outermost scope ends, scopes nest
+        '''
+
+        self._depth += 1
+        try:
+            yield self
+        finally:
+            self._depth -= 1
+            if not self._depth:
+                self._elements.clear()
+
+    def get(self, locator):
+        '''
+        Returns cached element for <locator>
+
+        Args:
+            locator (tuple): web element locator
+        Returns:
+            WebElement: cached element or None
+        '''
+
+        return self._elements.get(tuple(locator))
+
+    def put(self, locator, element):
+        '''
+        Caches <element> for <locator>, a no-op outside a scope
+
+        Args:
+            locator (tuple): web element locator
+            element (WebElement): located element
+        '''
+
+        if self._depth:
+            self._elements[tuple(locator)] = element
+
+    def discard(self, locator):
+        '''
+        Drops cached element for <locator>
+
+        Args:
+            locator (tuple): web element locator
+        '''
+
+        self._elements.pop(tuple(locator), None)
+
+    def clear(self):
+        '''
+        Drops every cached element
+        '''
+
+        self._elements.clear()
+
+    def __len__(self):
+        return len(self._elements)
@@ -0,0 +1,724 @@
+# -*- coding: utf-8 -*-
+'''
+In-process fake of the WebDriver API subset the helpers use, backed by an
+in-memory DOM model. Lets the pure python side of webdriver.py (retries,
+fallbacks, wait policies) run and be measured without a browser:
+
+    dom = FakeDOM()
+    dom.add((By.ID, 'save'), FakeElement('button', text='Save'))
+    selenium = Selenium.new_instance(driver=FakeDriver(dom), login=False)
+    selenium.button((By.ID, 'save'))
+'''
+
+# pylint: disable=invalid-name, unused-argument
+
+import array
+import itertools
+import sys
+import time
+
+from selenium.common.exceptions import NoSuchElementException, \
+    StaleElementReferenceException
+from selenium.webdriver.remote.webelement import WebElement
+
+import webdriver_pf as WD_PF
+
+
+# private use characters selenium sends for special keys
+BACK_SPACE = '\ue003'
+RETURN = '\ue006'
+ENTER = '\ue007'
+
+_ids = itertools.count(1)
+
+
+def _utf16_digest(text):
+    # length and FNV-1a hash over utf-16 code units, like CM_TRANSFER
+    units = array.array('H', text.encode('utf-16-le'))
+    if sys.byteorder != 'little':
+        units.byteswap()
+    digest = 0x811c9dc5
+    for unit in units:
+        digest = ((digest ^ unit) * 0x01000193) & 0xffffffff
+    return len(units), digest
+
+
+class FakeElement(WebElement):
+    '''
+    element of the in-memory DOM, a WebElement so ActionChains and the
+    expected conditions accept it
+    '''
+
+    def __init__(self, tag='div', text='', attributes=None, value='',
+                 displayed=True, enabled=True, obscured=False, rect=None,
+                 on_click=None, on_keys=None, options=None):
+        '''
+        Args:
+            tag (str): tag name
+            text (str): rendered text
+            attributes (dict): html attributes
+            value (str): current value of inputs
+            displayed (bool): visibility
+            enabled (bool): enabled state
+            obscured (bool): covered by another element at its centre
+            rect (dict): x, y, width and height
+            on_click (callable): called with the element when clicked
+            on_keys (callable): called with the element and the typed keys
+            options (list): (value, text) pairs of a select
+        '''
+
+        super().__init__(None, 'fake-{}'.format(next(_ids)))
+        self._tag_name = tag
+        self._text = text
+        self.attributes = dict(attributes or {})
+        self.value = value
+        self.displayed = displayed
+        self.enabled = enabled
+        self.obscured = obscured
+        self._rect = rect or {'x': 0, 'y': 0, 'width': 100, 'height': 20}
+        self.on_click = on_click
+        self.on_keys = on_keys
+        self.options = list(options or [])
+        self.attached = True
+        self.clicks = 0
+
+    def _execute(self, command, params=None):
+        params = dict(params or {})
+        params['id'] = self.id
+        params['element'] = self
+        return self._parent.execute(command, params)
+
+    @property
+    def tag_name(self):
+        return self._tag_name
+
+    @property
+    def rect(self):
+        return self._rect
+
+    @rect.setter
+    def rect(self, rect):
+        self._rect = rect
+
+    @property
+    def text(self):
+        return self._execute('getElementText')['value']
+
+    @text.setter
+    def text(self, text):
+        self._text = text
+
+    @property
+    def location(self):
+        return self._execute('getElementRect')['value']
+
+    @property
+    def size(self):
+        return self._execute('getElementRect')['value']
+
+    def click(self):
+        self._execute('clickElement')
+
+    def clear(self):
+        self._execute('clearElement')
+
+    def send_keys(self, *value):
+        self._execute('sendKeysToElement', {
+            'text': ''.join(str(item) for item in value)
+        })
+
+    def get_attribute(self, name):
+        return self._execute('getElementAttribute', {'name': name})['value']
+
+    def get_property(self, name):
+        return self._execute('getElementProperty', {'name': name})['value']
+
+    def is_displayed(self):
+        return self._execute('isElementDisplayed')['value']
+
+    def is_enabled(self):
+        return self._execute('isElementEnabled')['value']
+
+    def is_selected(self):
+        return self._execute('isElementSelected')['value']
+
+    def __repr__(self):
+        return '<FakeElement {0} {1}>'.format(self._tag_name, self.id)
+
+
+class FakeDOM(object):
+    '''elements of the loaded page, keyed by the locators that find them'''
+
+    def __init__(self, loader=None):
+        '''
+        Args:
+            loader (callable): called with the dom and url on navigation,
+                               to build the page
+        '''
+
+        self.loader = loader
+        self._elements = {}
+
+    def add(self, locator, element):
+        '''
+        makes <element> findable by <locator>
+        Args:
+            locator (tuple): (by, value) locator
+            element (FakeElement): element to add
+        Returns:
+            FakeElement: the element
+        '''
+
+        element.attached = True
+        self._elements.setdefault(tuple(locator), []).append(element)
+        return element
+
+    def remove(self, element):
+        '''
+        detaches <element>; held references go stale
+        Args:
+            element (FakeElement): element to remove
+        '''
+
+        element.attached = False
+        for elements in self._elements.values():
+            if element in elements:
+                elements.remove(element)
+
+    def find(self, by, value):
+        '''
+        Returns:
+            list: attached elements registered for (by, value)
+        '''
+
+        return list(self._elements.get((by, value), []))
+
+    def clear(self):
+        '''detaches every element'''
+
+        for elements in self._elements.values():
+            for element in elements:
+                element.attached = False
+        self._elements = {}
+
+    def navigate(self, url):
+        '''
+        replaces the page by the one <loader> builds for <url>; without a
+        loader the page is kept as built
+        Args:
+            url (str): loaded url
+        '''
+
+        if self.loader is not None:
+            self.clear()
+            self.loader(self, url)
+
+
+class FakeCommandExecutor(object):
+    '''routes WebDriver commands to the fake driver, like RemoteConnection'''
+
+    def __init__(self, driver, cdp=True):
+        self._driver = driver
+        self._commands = {}
+        if cdp:
+            self._commands['send_command'] = (
+                'POST', '/session/$sessionId/chromium/send_command'
+            )
+
+    def execute(self, command, params):
+        handler = getattr(self._driver, '_cmd_' + command, None)
+        if handler is None:
+            return {'value': None}
+        return {'value': handler(params or {})}
+
+
+class FakeDriver(object):
+    '''WebDriver stand-in running every command against a FakeDOM'''
+
+    def __init__(self, dom=None, title='fake', honor_implicit_wait=False,
+                 cdp=True):
+        '''
+        Args:
+            dom (FakeDOM): page model, Default: an empty one
+            title (str): page title
+            honor_implicit_wait (bool): make finds poll for the implicit
+                                        wait like a browser, off by default
+                                        so helpers run at full speed
+            cdp (bool): accept chrome devtools commands like chromedriver
+        '''
+
+        self.dom = dom or FakeDOM()
+        self.command_executor = FakeCommandExecutor(self, cdp)
+        self.honor_implicit_wait = honor_implicit_wait
+        self.page_title = title
+        self.url = 'about:blank'
+        self.timeouts = {'implicit': 0, 'pageLoad': 300000, 'script': 30000}
+        self.screenshots = []
+        self.cookies = []
+        self.local_storage = {}
+        self.session_storage = {}
+        self.nav_state = None
+        # tokens of dropdown options read since the last page load, drop
+        # them to simulate a changed dropdown
+        self.option_tokens = set()
+        self._handles = {}
+        # element INPUT_FOCUS focused and where its selection starts
+        self.focused = None
+        self.selection = 0
+        self.cm_chunks = None
+        self.scripts = {
+            WD_PF.JS.PROBE_ELEMENT: self._script_probe,
+            WD_PF.JS.COUNT_ELEMENTS: self._script_count,
+            WD_PF.JS.SETTLE: lambda *args: True,
+            WD_PF.JS.STORAGE_SNAPSHOT: self._script_storage_snapshot,
+            WD_PF.JS.STORAGE_RESTORE: self._script_storage_restore,
+            WD_PF.JS.STORAGE_CLEAR: self._script_storage_clear,
+            WD_PF.JS.NAV_MARK: self._script_nav_mark,
+            WD_PF.JS.NAV_FINGERPRINT: self._script_nav_fingerprint,
+            WD_PF.JS.WAIT_FOR: self._script_wait_for,
+            WD_PF.JS.SCROLL_TO: self._script_scroll_to,
+            WD_PF.JS.READ_MANY: self._script_read_many,
+            WD_PF.JS.READ_OPTIONS: self._script_read_options,
+            WD_PF.JS.FILL_FIELDS: self._script_fill_fields,
+            WD_PF.JS.INPUT_FOCUS: self._script_input_focus,
+            WD_PF.JS.CM_TRANSFER: self._script_cm_transfer,
+            WD_PF.JS.OPTIONS_VALID: lambda token: token in self.option_tokens,
+        }
+
+    # public WebDriver API
+
+    def execute(self, command, params=None):
+        '''
+        sends <command> through command_executor, like RemoteWebDriver
+        Returns:
+            dict: response with the command result under 'value'
+        '''
+
+        return self.command_executor.execute(command, params)
+
+    def find_element(self, by='id', value=None):
+        return self.execute('findElement', {'using': by, 'value': value})['value']
+
+    def find_elements(self, by='id', value=None):
+        return self.execute('findElements', {'using': by, 'value': value})['value']
+
+    def execute_script(self, script, *args):
+        return self.execute('executeScript', {
+            'script': script, 'args': list(args)
+        })['value']
+
+    def execute_async_script(self, script, *args):
+        return self.execute('executeAsyncScript', {
+            'script': script, 'args': list(args)
+        })['value']
+
+    def get(self, url):
+        self.execute('get', {'url': url})
+
+    @property
+    def current_url(self):
+        return self.execute('getCurrentUrl')['value']
+
+    @property
+    def title(self):
+        return self.execute('getTitle')['value']
+
+    def get_screenshot_as_file(self, filename):
+        self.execute('screenshot', {'filename': filename})
+        return True
+
+    def implicitly_wait(self, time_to_wait):
+        self.execute('setTimeouts', {'implicit': int(time_to_wait * 1000)})
+
+    def set_page_load_timeout(self, time_to_wait):
+        self.execute('setTimeouts', {'pageLoad': int(time_to_wait * 1000)})
+
+    def set_script_timeout(self, time_to_wait):
+        self.execute('setTimeouts', {'script': int(time_to_wait * 1000)})
+
+    def get_cookies(self):
+        return self.execute('getAllCookies')['value']
+
+    def add_cookie(self, cookie_dict):
+        self.execute('addCookie', {'cookie': cookie_dict})
+
+    def delete_all_cookies(self):
+        self.execute('deleteAllCookies')
+
+    def refresh(self):
+        self.execute('refresh')
+
+    def fullscreen_window(self):
+        self.execute('fullscreenWindow')
+
+    def quit(self):
+        self.execute('quit')
+
+    # command handlers
+
+    def _find(self, by, value):
+        deadline = time.time() + self.timeouts['implicit'] / 1000.0
+        while True:
+            elements = self.dom.find(by, value)
+            if elements or not self.honor_implicit_wait or \
+                    time.time() >= deadline:
+                break
+            time.sleep(0.01)
+        for element in elements:
+            element._parent = self
+            self._handles[element.id] = element
+        return elements
+
+    def _cmd_findElement(self, params):
+        elements = self._find(params['using'], params['value'])
+        if not elements:
+            raise NoSuchElementException(
+                'no fake element for {0} {1}'.format(
+                    params['using'], params['value']
+                )
+            )
+        return elements[0]
+
+    def _cmd_findElements(self, params):
+        return self._find(params['using'], params['value'])
+
+    def _run_script(self, params):
+        script, args = params['script'], params['args']
+        for arg in args:
+            if isinstance(arg, FakeElement):
+                self._check(arg)
+        handler = self.scripts.get(script)
+        if handler is not None:
+            return handler(*args)
+        if 'arguments[0].click()' in script:
+            return self._click(args[0])
+        if 'getBoundingClientRect' in script:
+            return dict(args[0].rect, top=args[0].rect['y'],
+                        left=args[0].rect['x'])
+        if 'CodeMirror.setValue' in script:
+            args[0].value = ''
+            return None
+        if 'CodeMirror.replaceSelection' in script:
+            args[0].value += args[1]
+            return None
+        return None
+
+    def _cmd_executeScript(self, params):
+        return self._run_script(params)
+
+    def _cmd_executeAsyncScript(self, params):
+        return self._run_script(params)
+
+    def _cmd_get(self, params):
+        self.url = params['url']
+        self.nav_state = None
+        self.option_tokens.clear()
+        self.dom.navigate(self.url)
+
+    def _cmd_refresh(self, params):
+        self.nav_state = None
+        self.dom.navigate(self.url)
+
+    def _touch(self):
+        # user interaction the page can observe
+        if self.nav_state is not None:
+            self.nav_state['touched'] = True
+
+    def _cmd_getCurrentUrl(self, params):
+        return self.url
+
+    def _cmd_getTitle(self, params):
+        return self.page_title
+
+    def _cmd_screenshot(self, params):
+        self.screenshots.append(params['filename'])
+
+    def _cmd_setTimeouts(self, params):
+        self.timeouts.update(params)
+
+    def _cmd_getAllCookies(self, params):
+        return [dict(cookie) for cookie in self.cookies]
+
+    def _cmd_addCookie(self, params):
+        self.cookies = [cookie for cookie in self.cookies
+                        if cookie['name'] != params['cookie']['name']]
+        self.cookies.append(dict(params['cookie']))
+
+    def _cmd_deleteAllCookies(self, params):
+        self.cookies = []
+
+    def _cmd_send_command(self, params):
+        # chrome devtools commands
+        if params['cmd'] == 'Network.setCookie':
+            cookie = dict(params['params'])
+            cookie.pop('url', None)
+            if 'expires' in cookie:
+                cookie['expiry'] = cookie.pop('expires')
+            self._cmd_addCookie({'cookie': cookie})
+            return {'success': True}
+        if params['cmd'] == 'Input.insertText' and self.focused is not None:
+            self._check(self.focused)
+            self._touch()
+            value = self.focused.value[:self.selection] + \
+                params['params']['text']
+            limit = self.focused.attributes.get('maxlength')
+            self.focused.value = value if limit is None else \
+                value[:int(limit)]
+            self.selection = len(self.focused.value)
+        return {}
+
+    @staticmethod
+    def _check(element):
+        if not element.attached:
+            raise StaleElementReferenceException(
+                'fake element {} is detached'.format(element.id)
+            )
+
+    def _click(self, element):
+        self._check(element)
+        self._touch()
+        element.clicks += 1
+        kind = element.attributes.get('type')
+        if element.tag_name == 'input' and kind in ('checkbox', 'radio'):
+            checked = kind == 'radio' or \
+                element.attributes.get('checked') != 'true'
+            element.attributes['checked'] = 'true' if checked else 'false'
+        if element.on_click is not None:
+            element.on_click(element)
+
+    def _cmd_actions(self, params):
+        # W3C actions from ActionChains: a pointer down and up clicks the
+        # element the pointer last moved to
+        target = None
+        for source in params['actions']:
+            if source['type'] != 'pointer':
+                continue
+            for action in source['actions']:
+                if action['type'] == 'pointerMove':
+                    origin = action.get('origin')
+                    if isinstance(origin, dict):
+                        target = self._handles.get(next(iter(origin.values())))
+                elif action['type'] == 'pointerUp' and target is not None:
+                    self._click(target)
+
+    def _cmd_clickElement(self, params):
+        self._click(params['element'])
+
+    def _cmd_clearElement(self, params):
+        self._check(params['element'])
+        self._touch()
+        params['element'].value = ''
+
+    def _cmd_sendKeysToElement(self, params):
+        element = params['element']
+        self._check(element)
+        self._touch()
+        for key in params['text']:
+            if key == BACK_SPACE:
+                element.value = element.value[:-1]
+            elif key not in (ENTER, RETURN):
+                element.value += key
+        if element.on_keys is not None:
+            element.on_keys(element, params['text'])
+
+    def _cmd_getElementText(self, params):
+        self._check(params['element'])
+        return params['element']._text if params['element'].displayed else ''
+
+    def _cmd_getElementRect(self, params):
+        self._check(params['element'])
+        return dict(params['element'].rect)
+
+    def _cmd_getElementAttribute(self, params):
+        element, name = params['element'], params['name']
+        self._check(element)
+        if name == 'value':
+            return element.value
+        if name == 'disabled':
+            return None if element.enabled else 'true'
+        return element.attributes.get(name)
+
+    def _cmd_getElementProperty(self, params):
+        return self._cmd_getElementAttribute(params)
+
+    def _cmd_isElementDisplayed(self, params):
+        self._check(params['element'])
+        return params['element'].displayed
+
+    def _cmd_isElementEnabled(self, params):
+        self._check(params['element'])
+        return params['element'].enabled
+
+    def _cmd_isElementSelected(self, params):
+        self._check(params['element'])
+        return params['element'].attributes.get('checked') == 'true'
+
+    # python implementations of the webdriver_pf scripts
+
+    def _script_probe(self, by, value, scroll=False):
+        elements = self._find(by, value)
+        if not elements:
+            return {'present': False}
+        element = elements[0]
+        return {
+            'present': True,
+            'element': element,
+            'displayed': element.displayed,
+            'enabled': element.enabled,
+            'in_viewport': True,
+            'obscured': element.obscured,
+            'rect': dict(element.rect),
+        }
+
+    def _script_count(self, by, value):
+        return len(self.dom.find(by, value))
+
+    def _script_storage_snapshot(self):
+        return {'local': dict(self.local_storage),
+                'session': dict(self.session_storage)}
+
+    def _script_storage_restore(self, local, session):
+        self.local_storage.update(local or {})
+        self.session_storage.update(session or {})
+
+    def _script_storage_clear(self):
+        self.local_storage.clear()
+        self.session_storage.clear()
+
+    def _script_nav_mark(self, token):
+        self.nav_state = {'token': token, 'touched': False}
+        return self.url
+
+    def _script_nav_fingerprint(self):
+        state = self.nav_state or {'token': None, 'touched': True}
+        return dict(state, url=self.url, ready='complete')
+
+    def _script_wait_for(self, checks, mode, slice_ms):
+        conditions = {
+            'present': lambda els, _: els[0] if els else False,
+            'absent': lambda els, _: not els,
+            'visible': lambda els, _: els[0] if els and els[0].displayed
+                                      else False,
+            'invisible': lambda els, _: not els or not els[0].displayed,
+            'clickable': lambda els, _: els[0] if els and els[0].displayed and
+                                        els[0].enabled else False,
+            'text': lambda els, text: bool(els) and text in els[0]._text,
+        }
+        deadline = time.time() + slice_ms / 1000.0
+        while True:
+            results = [conditions[condition](self._find(by, value), text)
+                       for by, value, condition, text in checks]
+            met = len([result for result in results if result])
+            done = met == len(results) if mode == 'all' else met > 0
+            # the page only changes from other threads, e.g. on_click timers
+            if done or time.time() >= deadline:
+                return {'done': done, 'results': results}
+            time.sleep(0.01)
+
+    def _script_scroll_to(self, by, value, block, inline, container, restart,
+                          cap_ms):
+        deadline = time.time() + cap_ms / 1000.0
+        while True:
+            elements = self._find(by, value)
+            element = elements[0] if elements else None
+            if element is not None and element.displayed:
+                return {'found': True, 'visible': True, 'element': element}
+            if time.time() >= deadline:
+                return {'found': element is not None, 'visible': False,
+                        'element': element}
+            time.sleep(0.01)
+
+    def _script_read_many(self, by, value, fields):
+        rows = []
+        for element in self._find(by, value):
+            row = []
+            for field in fields:
+                kind, _, name = field.partition(':')
+                if kind == 'text':
+                    row.append(element._text if element.displayed else '')
+                elif kind in ('attr', 'prop'):
+                    row.append(self._cmd_getElementAttribute(
+                        {'element': element, 'name': name}
+                    ))
+                else:
+                    row.append(None)
+            rows.append(row)
+        return rows
+
+    def _script_read_options(self, by, value, token):
+        # options are the elements registered for the open menu
+        if not self._find(*WD_PF.DROPDOWN.SELECT_OPTIONS_XPATH):
+            return None
+        self.option_tokens.add(token)
+        options = self._find(*WD_PF.DROPDOWN.SELECT_OPTION)
+        read = [{
+            'label': element.attributes.get('aria-label', element._text),
+            'value': element.attributes.get('data-value'),
+            'disabled': 'is-disabled' in element.attributes.get('class', ''),
+            'index': index,
+        } for index, element in enumerate(options)]
+        # the script closes the menu again
+        for element in self._find(*WD_PF.DROPDOWN.SELECT_OPTIONS_XPATH) + \
+                options:
+            self.dom.remove(element)
+        return read
+
+    def _script_fill_fields(self, fields):
+        results = []
+        for by, value, text, checked in fields:
+            elements = self._find(by, value)
+            if not elements:
+                results.append('missing')
+                continue
+            element = elements[0]
+            kind = element.attributes.get('type')
+            if not element.enabled:
+                results.append('keys')
+            elif kind == 'file':
+                results.append('file')
+            elif element.tag_name == 'input' and \
+                    kind in ('checkbox', 'radio'):
+                current = element.attributes.get('checked') == 'true'
+                if current != checked and kind == 'radio' and not checked:
+                    results.append('radio')
+                    continue
+                if current != checked:
+                    self._click(element)
+                results.append('filled')
+            elif element.tag_name == 'select':
+                matches = [
+                    option for option, label in element.options
+                    if text in (option, label.strip())
+                ]
+                if matches:
+                    self._touch()
+                    element.value = matches[0]
+                results.append('filled' if matches else 'select')
+            elif element.tag_name in ('input', 'textarea'):
+                self._touch()
+                element.value = text
+                results.append('filled')
+            else:
+                results.append('keys')
+        return results
+
+    def _script_input_focus(self, element, select_all):
+        self.focused = element
+        self.selection = 0 if select_all else len(element.value)
+        return element.value
+
+    def _script_cm_transfer(self, element, chunk, index, count, length,
+                            expected):
+        if index == 0:
+            self.cm_chunks = []
+        if self.cm_chunks is None or len(self.cm_chunks) != index:
+            return {'done': True, 'ok': False, 'stage': 'order', 'length': 0,
+                    'hash': 0}
+        self.cm_chunks.append(chunk)
+        if index < count - 1:
+            return {'done': False, 'ok': True}
+        element.value = ''.join(self.cm_chunks)
+        self.cm_chunks = None
+        actual, digest = _utf16_digest(element.value)
+        return {'done': True, 'stage': 'editor', 'length': actual,
+                'hash': digest, 'ok': (actual, digest) == (length, expected)}
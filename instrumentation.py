@@ -0,0 +1,322 @@
+# -*- coding: utf-8 -*-
+'''Opt-in latency instrumentation for the webdriver helpers'''
+
+# pylint: disable=invalid-name
+
+import collections
+import functools
+import inspect
+import json
+import math
+import os
+import threading
+import time
+
+from logger import CustomLogger
+
+
+LOG = CustomLogger(__name__)
+
+# set HELPER_METRICS=1 to instrument the helpers in webdriver.py
+ENABLED = os.getenv('HELPER_METRICS', '').lower() not in ('', '0', 'false')
+
+# json file the session summary is written to, if set
+METRICS_FILE = os.getenv('HELPER_METRICS_FILE')
+
+
+class Histogram(object):
+    '''streaming histogram of durations with logarithmic buckets'''
+
+    # lower bound of the first bucket in secs and growth between buckets
+    MIN = 0.0001
+    GROWTH = 1.25
+
+    def __init__(self):
+        self.buckets = collections.Counter()
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+
+    def add(self, value):
+        '''
+        records one duration
+        Args:
+            value (float): duration in secs
+        '''
+
+        index = 0 if value <= self.MIN else \
+            int(math.log(value / self.MIN, self.GROWTH)) + 1
+        self.buckets[index] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = max(self.max, value)
+
+    def percentile(self, pct):
+        '''
+        approximates a percentile by the upper bound of its bucket
+        Args:
+            pct (float): percentile between 0 and 100
+        Returns:
+            float: duration in secs
+        '''
+
+        if not self.count:
+            return 0.0
+
+        target = pct / 100.0 * self.count
+        running = 0
+        for index in sorted(self.buckets):
+            running += self.buckets[index]
+            if running >= target:
+                return min(self.MIN * self.GROWTH ** index, self.max)
+        return self.max
+
+    def as_dict(self):
+        '''
+        Returns:
+            dict: count, total, mean, min, max, p50, p90 and p99 in secs
+        '''
+
+        return {
+            'count': self.count,
+            'total': round(self.total, 4),
+            'mean': round(self.total / self.count, 4) if self.count else 0.0,
+            'min': round(self.min or 0.0, 4),
+            'max': round(self.max, 4),
+            'p50': round(self.percentile(50), 4),
+            'p90': round(self.percentile(90), 4),
+            'p99': round(self.percentile(99), 4),
+        }
+
+
+class MetricsScope(object):
+    '''helper latencies collected over one test or the whole session'''
+
+    def __init__(self, name):
+        self.name = name
+        self.helpers = collections.defaultdict(Histogram)
+        self.locators = collections.defaultdict(Histogram)
+        self.events = collections.Counter()
+        self.helper_time = 0.0
+        self.wait_time = 0.0
+
+    def summary(self, top=10):
+        '''
+        Args:
+            top (int): number of slowest locators to report
+        Returns:
+            dict: per helper histograms, waits, fallbacks and slow locators
+        '''
+
+        locators = sorted(
+            self.locators.items(), key=lambda item: item[1].total, reverse=True
+        )[:top]
+        return {
+            'name': self.name,
+            'helper_time': round(self.helper_time, 4),
+            'wait_time': round(self.wait_time, 4),
+            'helpers': {
+                helper: histogram.as_dict()
+                for helper, histogram in sorted(self.helpers.items())
+            },
+            'events': dict(self.events),
+            'slowest_locators': [
+                {'helper': helper, 'locator': locator,
+                 'total': round(histogram.total, 4), 'count': histogram.count}
+                for (helper, locator), histogram in locators
+            ],
+        }
+
+
+class HelperMetrics(object):
+    '''
+    records wall time per helper call, time spent in wait_* helpers,
+    fallback events and locators, per test and per session
+    '''
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.session = MetricsScope('session')
+        self.test = None
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def current_helper(self):
+        '''
+        Returns:
+            str: outermost helper running on this thread, None outside helpers
+        '''
+
+        stack = self._stack()
+        return stack[0] if stack else None
+
+    def wrap(self, name, func):
+        '''
+        wraps <func> so each call is timed as helper <name>
+        Args:
+            name (str): helper name
+            func (callable): helper to wrap
+        Returns:
+            callable: timed helper
+        '''
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            stack = self._stack()
+            in_wait = any(helper.startswith('wait_') for helper in stack)
+            stack.append(name)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                stack.pop()
+                self._record(
+                    name, elapsed, _locator_of(args[1:], kwargs),
+                    outermost=not stack,
+                    wait=name.startswith('wait_') and not in_wait
+                )
+
+        wrapper.instrumented = True
+        return wrapper
+
+    def _record(self, name, elapsed, locator, outermost, wait):
+        with self._lock:
+            for scope in (self.session, self.test):
+                if scope is None:
+                    continue
+                scope.helpers[name].add(elapsed)
+                if locator is not None:
+                    scope.locators[(name, locator)].add(elapsed)
+                if outermost:
+                    scope.helper_time += elapsed
+                if wait:
+                    scope.wait_time += elapsed
+
+    def event(self, helper, name):
+        '''
+        counts a retry/fallback event, e.g. which button() branch ran
+        Args:
+            helper (str): helper name
+            name (str): event name
+        '''
+
+        if not ENABLED:
+            return
+
+        with self._lock:
+            for scope in (self.session, self.test):
+                if scope is not None:
+                    scope.events['{0}.{1}'.format(helper, name)] += 1
+
+    def start_test(self, nodeid):
+        '''
+        opens a per test scope
+        Args:
+            nodeid (str): pytest node id
+        '''
+
+        with self._lock:
+            self.test = MetricsScope(nodeid)
+
+    def end_test(self):
+        '''
+        closes the per test scope
+        Returns:
+            dict: summary of the test, None if no test was running
+        '''
+
+        with self._lock:
+            scope, self.test = self.test, None
+        return scope.summary(top=5) if scope is not None else None
+
+    def session_summary(self):
+        '''
+        Returns:
+            dict: summary of the whole session
+        '''
+
+        with self._lock:
+            return self.session.summary()
+
+    def write(self, path):
+        '''
+        writes the session summary as json to <path>
+        Args:
+            path (str): file path
+        '''
+
+        with open(path, 'w') as outfile:
+            json.dump(self.session_summary(), outfile, indent=4)
+
+
+def _locator_of(args, kwargs):
+    '''
+    Returns:
+        str: value of the first (by, value) locator argument, if any
+    '''
+
+    for value in list(args) + list(kwargs.values()):
+        if isinstance(value, (tuple, list)) and len(value) == 2 and \
+                isinstance(value[0], str) and isinstance(value[1], str):
+            return value[1]
+    return None
+
+
+METRICS = HelperMetrics()
+
+
+def instrument(*classes):
+    '''
+    wraps every public method defined on <classes> with METRICS timing
+    Args:
+        classes (class): helper classes to instrument
+    '''
+
+    for cls in classes:
+        for name, member in list(vars(cls).items()):
+            if name.startswith('_') or not inspect.isfunction(member) or \
+                    getattr(member, 'instrumented', False):
+                continue
+            # context managers only hand out a generator, nothing to time
+            if inspect.isgeneratorfunction(getattr(member, '__wrapped__', None)):
+                continue
+            setattr(cls, name, METRICS.wrap(name, member))
+
+
+def format_summary(summary):
+    '''
+    renders a summary as a short multi line report
+    Args:
+        summary (dict): MetricsScope summary
+    Returns:
+        str: report
+    '''
+
+    lines = ['helper metrics for {0}: helpers {1}s, waits {2}s'.format(
+        summary['name'], summary['helper_time'], summary['wait_time']
+    )]
+    helpers = sorted(
+        summary['helpers'].items(), key=lambda item: item[1]['total'],
+        reverse=True
+    )
+    for helper, stats in helpers:
+        lines.append(
+            '  {0:<40} n={1:<6} total={2:<9} p50={3:<8} p90={4:<8} '
+            'max={5}'.format(helper, stats['count'], stats['total'],
+                             stats['p50'], stats['p90'], stats['max'])
+        )
+    if summary['events']:
+        lines.append('  events: {}'.format(summary['events']))
+    for item in summary['slowest_locators']:
+        lines.append('  slow locator: {0} {1} total={2} n={3}'.format(
+            item['helper'], item['locator'], item['total'], item['count']
+        ))
+    return '\n'.join(lines)
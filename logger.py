@@ -3,12 +3,111 @@
 
 # pylint: disable=no-self-use, invalid-name
 
+import atexit
 import logging
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
 
 from colorlog import ColoredFormatter
 
 DEFAULT_LOG_LEVEL = 'DEBUG'
 
+# byte cap for messages passed through CustomLogger.truncate, <= 0 disables
+MAX_BODY_BYTES = int(os.getenv('LOG_MAX_BODY_BYTES', 10240))
+
+# max records waiting for the console writer, further records are dropped
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))
+
+RESPONSE = 5
+PAYLOAD = 6
+STATUS = 15
+URL = 16
+
+
+class _DroppingQueueHandler(QueueHandler):
+    '''
+    queue handler that never blocks the logging thread: records are dropped
+    when the queue is full and written inline once the pipeline is stopped
+    '''
+
+    def __init__(self, log_queue, console):
+        super().__init__(log_queue)
+        self.console = console
+        self.running = False
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def handle(self, record):
+        if not self.running:
+            return self.console.handle(record)
+        return super().handle(record)
+
+
+class _LogPipeline(object):
+    '''one console handler shared by all loggers, fed by a background thread'''
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.handler = None
+        self.listener = None
+
+    def start(self, console):
+        '''
+        start the background writer for <console>
+
+        Args:
+            console(logging.Handler): handler doing the formatting and writes
+        '''
+
+        self.handler = _DroppingQueueHandler(
+            queue.Queue(maxsize=LOG_QUEUE_SIZE), console
+        )
+        self.listener = QueueListener(self.handler.queue, console)
+        self.listener.start()
+        self.handler.running = True
+        atexit.register(self.stop)
+
+    def stop(self):
+        '''
+        flush queued records and stop the background writer; later records
+        are written inline
+        '''
+
+        with self.lock:
+            if self.handler is None or not self.handler.running:
+                return
+            self.handler.running = False
+            self.listener.stop()
+            if self.handler.dropped:
+                self.handler.console.handle(logging.makeLogRecord({
+                    'name': __name__, 'levelno': logging.WARNING,
+                    'levelname': 'WARNING',
+                    'msg': '{} log records dropped, log queue was full'.format(
+                        self.handler.dropped
+                    )
+                }))
+
+
+_PIPELINE = _LogPipeline()
+
+
+def shutdown_logging():
+    '''
+    flush every queued record to the console, call at session end
+
+    Returns:
+        None
+    '''
+
+    _PIPELINE.stop()
+
 class CustomLogger(object):
     '''
     customization on logging module.
@@ -25,6 +124,12 @@ class CustomLogger(object):
         * LOG.error     - [ERROR]
         * LOG.critical  - [CRITICAL]
 
+    every level method also accepts a callable returning the message; it is
+    only called when the level is enabled, so expensive messages cost
+    nothing when filtered out::
+
+        LOG.response(lambda: LOG.truncate(json.dumps(body, indent=4)))
+
     '''
 
     def __init__(self, name):
@@ -38,20 +143,28 @@ class CustomLogger(object):
            None
         '''
 
-        # create custom levels
-        self.__addCustomLevels()
+        with _PIPELINE.lock:
+            if _PIPELINE.handler is None:
+                # create custom levels
+                self.__addCustomLevels()
 
-        # create console and file handler
-        self._ch = logging.StreamHandler()
+                # create console and file handler
+                self._ch = logging.StreamHandler()
 
-        # add custom formatter to console handler
-        self.__addCustomFormatter()
+                # add custom formatter to console handler
+                self.__addCustomFormatter()
+
+                # console writes happen on the pipeline thread
+                _PIPELINE.start(self._ch)
+
+        self._ch = _PIPELINE.handler.console
 
         # create custom logger
         self._logger = logging.getLogger(name)
 
-        # add console to logger
-        self._logger.addHandler(self._ch)
+        # add shared queue handler to logger
+        if _PIPELINE.handler not in self._logger.handlers:
+            self._logger.addHandler(_PIPELINE.handler)
 
         # set level to log level
         self._logger.setLevel(DEFAULT_LOG_LEVEL)
@@ -61,117 +174,159 @@ class CustomLogger(object):
         custom response log level
 
         Args:
-            msg (str): message to log
+            msg (str|callable): message to log
 
         Returns:
             None
         '''
 
-        return self._logger.response(msg)
+        return self.__log(RESPONSE, msg)
 
     def payload(self, msg):
         '''
         custom payload log level
 
         Args:
-            msg (str): message to log
+            msg (str|callable): message to log
 
         Returns:
             None
         '''
 
-        return self._logger.payload(msg)
+        return self.__log(PAYLOAD, msg)
 
     def debug(self, msg):
         '''
         custom debug log level
 
         Args:
-            msg (str): message to log
+            msg (str|callable): message to log
 
         Returns:
             None
         '''
 
-        return self._logger.debug(msg)
+        return self.__log(logging.DEBUG, msg)
 
     def url(self, msg):
         '''
         custom url log level
 
         Args:
-            msg (str): message to log
+            msg (str|callable): message to log
 
         Returns:
             None
         '''
 
-        return self._logger.url(msg)
+        return self.__log(URL, msg)
 
     def status(self, msg):
         '''
         custom status log level
 
         Args:
-            msg (str): message to log
+            msg (str|callable): message to log
 
         Returns:
             None
         '''
 
-        return self._logger.status(msg)
+        return self.__log(STATUS, msg)
 
     def info(self, msg):
         '''
         info log level
 
         Args:
-            msg (str): message to log
+            msg (str|callable): message to log
 
         Returns:
             None
         '''
 
-        return self._logger.info(msg)
+        return self.__log(logging.INFO, msg)
 
     def warning(self, msg):
         '''
         warning log level
 
         Args:
-            msg (str): message to log
+            msg (str|callable): message to log
 
         Returns:
             None
         '''
 
-        return self._logger.warning(msg)
+        return self.__log(logging.WARNING, msg)
 
     def error(self, msg):
         '''
         error log level
 
         Args:
-            msg (str): message to log
+            msg (str|callable): message to log
 
         Returns:
             None
         '''
 
-        return self._logger.error(msg)
+        return self.__log(logging.ERROR, msg)
 
     def critical(self, msg):
         '''
         error log level
 
         Args:
-            msg (str): message to log
+            msg (str|callable): message to log
 
         Returns:
             None
         '''
 
-        return self._logger.critical(msg)
+        return self.__log(logging.CRITICAL, msg)
+
+    def isEnabledFor(self, level):
+        '''
+        tells whether messages of <level> are emitted
+
+        Args:
+            level (int): logging level
+
+        Returns:
+            bool
+        '''
+
+        return self._logger.isEnabledFor(level)
+
+    def truncate(self, string, limit=None):
+        '''
+        cap a message to <limit> utf-8 bytes, useful for logging bodies
+
+        Args:
+            string(str): message to be capped
+            limit(int): byte cap, Default: MAX_BODY_BYTES
+
+        Returns:
+            str: message, truncated with a marker if longer than the cap
+        '''
+
+        if limit is None:
+            limit = MAX_BODY_BYTES
+        if not isinstance(string, str):
+            string = str(string)
+
+        # a character is at most 4 bytes, short messages need no encoding
+        if limit <= 0 or len(string) * 4 <= limit:
+            return string
+
+        encoded = string.encode('utf-8')
+        if len(encoded) <= limit:
+            return string
+
+        return '{0}... [truncated {1} bytes]'.format(
+            encoded[:limit].decode('utf-8', 'ignore'), len(encoded) - limit
+        )
 
     def red(self, string):
         '''
@@ -236,11 +391,6 @@ class CustomLogger(object):
             None
         '''
 
-        RESPONSE = 5
-        PAYLOAD = 6
-        STATUS = 15
-        URL = 16
-
         levels = [
             (RESPONSE, 'RESPONSE'),
             (PAYLOAD, 'PAYLOAD'),
@@ -348,6 +498,24 @@ class CustomLogger(object):
         # add formatter to console handler
         self._ch.setFormatter(formatter)
 
+    def __log(self, level, msg):
+        '''
+        log <msg> at <level>, evaluating callable messages only if enabled
+
+        Args:
+            level(int): logging level
+            msg(str|callable): message or callable returning it
+
+        Returns:
+            None
+        '''
+
+        if not self._logger.isEnabledFor(level):
+            return None
+        if callable(msg):
+            msg = msg()
+        return self._logger.log(level, msg)
+
     def __color(self, string, color):
         '''
         set specified color string
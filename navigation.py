@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+'''Python module that tracks whether the loaded page is still clean'''
+
+# pylint: disable=broad-except
+
+import uuid
+
+import command_counter
+import webdriver_pf as WD_PF
+from logger import CustomLogger
+
+
+LOG = CustomLogger(__name__)
+
+
+class NavigationTracker(object):
+    '''
+    Knows whether the page a session loaded is still as it was loaded.
+
+    mark_clean() tags the window with a token and starts listening for user
+    interaction. is_clean() compares url, token and interaction flag in one
+    script call, or in none at all if the session's driver counts its
+    commands (command_counter.install) and sent none since the page was
+    last found clean.
+    '''
+
+    def __init__(self, selenium):
+        '''
+        Args:
+            selenium (BaseDriver): session whose page is tracked
+        '''
+
+        self.selenium = selenium
+        self.url = None
+        self.token = None
+        self._commands = None
+
+    def mark_clean(self):
+        '''
+        records the loaded page as clean
+        '''
+
+        self.token = uuid.uuid4().hex
+        try:
+            self.url = self.selenium.driver.execute_script(
+                WD_PF.JS.NAV_MARK, self.token
+            )
+            self._commands = self._sent()
+        except Exception as exception:
+            LOG.debug('failed to mark page clean: {}'.format(exception))
+            self.invalidate()
+
+    def invalidate(self):
+        '''
+        forgets the clean page, the next is_clean() returns False
+        '''
+
+        self.token = None
+        self._commands = None
+
+    def is_clean(self):
+        '''
+        Returns:
+            bool: True if the page is the one marked clean, at the same url
+                  and without user interaction since
+        '''
+
+        if self.token is None:
+            return False
+
+        if self._commands is not None and self._commands == self._sent():
+            return True
+
+        try:
+            state = self.selenium.driver.execute_script(
+                WD_PF.JS.NAV_FINGERPRINT
+            )
+        except Exception as exception:
+            LOG.debug('failed to fingerprint page: {}'.format(exception))
+            self.invalidate()
+            return False
+
+        clean = state['token'] == self.token and not state['touched'] and \
+            state['url'] == self.url and state['ready'] == 'complete'
+        if clean:
+            self._commands = self._sent()
+        else:
+            self.invalidate()
+        return clean
+
+    def _sent(self):
+        '''
+        Returns:
+            int: commands the session's driver sent, None if it does not
+                 count them
+        '''
+
+        driver = self.selenium.driver
+        if isinstance(driver.command_executor,
+                      command_counter.CountingCommandExecutor):
+            return command_counter.sent(driver)
+        return None
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+'''Python module with the polling policies the waits run on'''
+
+import itertools
+import time
+
+from selenium.common.exceptions import NoSuchElementException, \
+    TimeoutException
+
+import constants
+
+
+class PollingPolicy(object):
+    '''
+    Poll intervals of a wait: <fast_polls> polls every <initial> secs, then
+    growing by <backoff> per poll up to <max_interval>.
+
+    Conditions that hold quickly are seen within <initial> secs, long waits
+    send few commands.
+    '''
+
+    def __init__(self, initial=constants.POLLING.INITIAL,
+                 fast_polls=constants.POLLING.FAST_POLLS,
+                 backoff=constants.POLLING.BACKOFF,
+                 max_interval=constants.POLLING.MAX_INTERVAL):
+        '''
+        Args:
+            initial (float): secs between the first polls
+            fast_polls (int): number of polls at <initial> before backing off
+            backoff (float): growth factor of the interval once backing off
+            max_interval (float): upper cap of the interval in secs
+        '''
+
+        if initial <= 0 or backoff < 1 or max_interval < initial:
+            raise ValueError('invalid polling policy {0}, {1}, {2}'.format(
+                initial, backoff, max_interval
+            ))
+        self.initial = initial
+        self.fast_polls = fast_polls
+        self.backoff = backoff
+        self.max_interval = max_interval
+
+    def intervals(self):
+        '''
+        Returns:
+            iterator: endless secs to sleep between consecutive polls
+        '''
+
+        interval = self.initial
+        for poll in itertools.count():
+            yield interval
+            if poll + 1 >= self.fast_polls:
+                interval = min(interval * self.backoff, self.max_interval)
+
+    def __repr__(self):
+        return 'PollingPolicy({0}, {1}, {2}, {3})'.format(
+            self.initial, self.fast_polls, self.backoff, self.max_interval
+        )
+
+
+# policy of the waits not given one explicitly
+DEFAULT = PollingPolicy()
+
+# a fixed interval, what WebDriverWait does
+FIXED = PollingPolicy(initial=0.5, fast_polls=0, backoff=1, max_interval=0.5)
+
+
+def set_default(policy):
+    '''
+    Makes <policy> the policy of every wait not given one explicitly
+    Args:
+        policy (PollingPolicy): new default
+    '''
+
+    global DEFAULT  # pylint: disable=global-statement
+    DEFAULT = policy
+
+
+class PolicyWait(object):
+    '''WebDriverWait counterpart polling on a PollingPolicy'''
+
+    def __init__(self, driver, timeout, policy=None, ignored_exceptions=None):
+        '''
+        Args:
+            driver (WebDriver): driver handed to the conditions
+            timeout (float): secs until TimeoutException
+            policy (PollingPolicy): poll intervals, Default: DEFAULT
+            ignored_exceptions (iterable): exceptions of the condition that
+                                           count as not met, on top of
+                                           NoSuchElementException
+        '''
+
+        self._driver = driver
+        self._timeout = timeout
+        self._policy = policy or DEFAULT
+        self._ignored = (NoSuchElementException,) + \
+            tuple(ignored_exceptions or ())
+
+    def until(self, method, message=''):
+        '''
+        Calls <method> with the driver until it returns a truthy value
+        Returns:
+            object: the truthy value
+        Raises:
+            TimeoutException: if it does not within the timeout
+        '''
+
+        screen = stacktrace = None
+        end = time.monotonic() + self._timeout
+        intervals = self._policy.intervals()
+        while True:
+            try:
+                value = method(self._driver)
+                if value:
+                    return value
+            except self._ignored as exception:
+                screen = getattr(exception, 'screen', None)
+                stacktrace = getattr(exception, 'stacktrace', None)
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutException(message, screen, stacktrace)
+            time.sleep(min(next(intervals), remaining))
+
+    def until_not(self, method, message=''):
+        '''
+        Calls <method> with the driver until it returns a falsy value or
+        raises one of the ignored exceptions
+        Returns:
+            object: the falsy value, True on an ignored exception
+        Raises:
+            TimeoutException: if it does not within the timeout
+        '''
+
+        end = time.monotonic() + self._timeout
+        intervals = self._policy.intervals()
+        while True:
+            try:
+                value = method(self._driver)
+                if not value:
+                    return value
+            except self._ignored:
+                return True
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutException(message)
+            time.sleep(min(next(intervals), remaining))
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+
+'''Python module that caches REST GET responses.'''
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class CacheEntry(object):
+    '''Cached response body with its ETag and expiry.'''
+
+    def __init__(self, content, etag, expires):
+        '''
+        Args:
+            :content (bytes): raw response body.
+            :etag (str): ETag header of the response, None if not sent.
+            :expires (float): epoch secs after which it must be revalidated.
+        '''
+
+        self.content = content
+        self.etag = etag
+        self.expires = expires
+
+    def is_fresh(self):
+        '''This routine tells whether the entry can be served as is.
+
+        Returns:
+            bool: True until the entry expires.
+        '''
+
+        return time.time() < self.expires
+
+
+class ResponseCache(object):
+    '''Thread safe LRU cache with TTL for GET responses.
+
+    Keys carry the resource prefix (first path segment) of the relative url
+    so that writes can drop every cached read of the same resource.
+    '''
+
+    def __init__(self, size=256, ttl=60):
+        '''
+        Args:
+            :size (int, optional): Max entries kept. Default: 256.
+            :ttl (int, optional): Secs an entry is served without
+                                  revalidation. Default: 60.
+        '''
+
+        self.size = size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def resource(relative_url):
+        '''This routine returns the resource prefix of a relative url.
+
+        Args:
+            :relative_url (str): e.g. 'projects/1234/versions'.
+
+        Returns:
+            str: first path segment, e.g. 'projects'.
+        '''
+
+        return relative_url.split('?')[0].strip('/').split('/')[0]
+
+    def key(self, apiVersion, relative_url, params=None):
+        '''This routine builds the cache key of a GET call.
+
+        Args:
+            :apiVersion (str): key of API.VERSION_URL_MAP.
+            :relative_url (str): Relative URL of the call.
+            :params (dict, optional): query params of the call.
+
+        Returns:
+            tuple: cache key.
+        '''
+
+        return (
+            apiVersion, self.resource(relative_url), relative_url,
+            repr(sorted((params or {}).items()))
+        )
+
+    def get(self, key):
+        '''This routine returns the entry for <key>, fresh or not.
+
+        Returns:
+            CacheEntry: cached entry or None.
+        '''
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, content, etag=None, ttl=None):
+        '''This routine caches a response body, evicting the least recently
+        used entry when full.
+
+        Args:
+            :key (tuple): see key().
+            :content (bytes): raw response body.
+            :etag (str, optional): ETag of the response.
+            :ttl (int, optional): Secs to serve it. Default: cache ttl.
+        '''
+
+        expires = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = CacheEntry(content, etag, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def refresh(self, key, ttl=None):
+        '''This routine extends an entry revalidated by the server (304).
+
+        Args:
+            :key (tuple): see key().
+            :ttl (int, optional): Secs to serve it. Default: cache ttl.
+        '''
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.expires = time.time() + (self.ttl if ttl is None else ttl)
+
+    def invalidate(self, apiVersion, relative_url):
+        '''This routine drops every entry of the resource <relative_url>
+        belongs to.
+
+        Args:
+            :apiVersion (str): key of API.VERSION_URL_MAP.
+            :relative_url (str): Relative URL of the write.
+        '''
+
+        resource = self.resource(relative_url)
+        with self._lock:
+            for key in [key for key in self._entries
+                        if key[0] == apiVersion and key[1] == resource]:
+                del self._entries[key]
+
+    def clear(self):
+        '''This routine drops every entry.'''
+
+        with self._lock:
+            self._entries.clear()
@@ -5,13 +5,18 @@
 # pylint: disable=too-many-branches, too-many-statements
 # pyling: disable=too-many-return-statements
 
+import threading
+
 import ujson as json
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from constants import CREDS
 from constants import API
+from constants import LOGIN
 from logger import CustomLogger
+from response_cache import ResponseCache
 
 
 LOG = CustomLogger(__name__)
@@ -29,6 +34,17 @@ class REST(object):
             :password (str, optional): Passwd for auth. Default: 'Password'.
             :port (int, optional): Port for sending REST calls. Default: 80.
             :baseURL (str, optional): URI for REST calls. Default: .
+            :pool_size (int, optional): Max keep-alive connections kept to
+                                        the server. Default: 10.
+            :headers (dict, optional): Headers sent with every call, the
+                                       headers of a single call are merged
+                                       over them instead of replacing them.
+                                       Default: json content-type.
+            :cache (bool, optional): Cache GET responses, revalidated with
+                                     ETag once expired. Default: False.
+            :cache_size (int, optional): Max cached responses. Default: 256.
+            :cache_ttl (int, optional): Secs a cached response is served
+                                        without revalidation. Default: 60.
 
         Returns:
             Returns REST object instance.
@@ -43,15 +59,125 @@ class REST(object):
         if not self.ip:
             raise NameError('IP address {} not set'.format(self.ip))
 
+        self.pool_size = kwargs.pop('pool_size', 10)
+        self.headers = kwargs.pop('headers', {'content-type': 'application/json'})
+        self._baseURLs = {}
+        self.cache_enabled = kwargs.pop('cache', False)
+        self._cache = ResponseCache(
+            size=kwargs.pop('cache_size', 256), ttl=kwargs.pop('cache_ttl', 60)
+        )
+
+        # one connection pool shared by the per thread sessions, connections
+        # beyond pool_size are opened as needed and not kept alive, so a
+        # leaked streamed response can not block the other callers
+        self._adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=self.pool_size, pool_block=False
+        )
+        self._local = threading.local()
+        self._sessions = []
+        self._sessions_lock = threading.Lock()
+
         # Disable HTTPS certificate warning.
         requests.packages.urllib3.disable_warnings()
 
+    @property
+    def session(self):
+        '''
+        keep-alive session of the calling thread, sessions of all threads
+        share one connection pool. Cookies are dropped before every call,
+        so like single requests no call sends the cookies of an earlier one
+
+        Returns:
+            requests.Session: session with auth and headers preconfigured
+        '''
+
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.auth = (self.username, self.password)
+            session.headers.update(self.headers)
+            session.verify = False
+            session.mount('https://', self._adapter)
+            session.mount('http://', self._adapter)
+            self._local.session = session
+            with self._sessions_lock:
+                self._sessions.append(session)
+        return session
+
+    def close(self):
+        '''This routine closes the sessions of every thread and the pooled
+        connections, the next call opens a new session.'''
+
+        with self._sessions_lock:
+            sessions, self._sessions = self._sessions, []
+            self._local = threading.local()
+        for session in sessions:
+            session.close()
+        self._adapter.close()
+
+    def login_cookies(self, relative_url=LOGIN.REST_URL, **kwargs):
+        '''This routine authenticates against <relative_url> with the
+        credentials and returns the session cookies the server set.
+
+        Args:
+            :relative_url (str, optional): Relative URL authenticated with
+                                           basic auth. Default: LOGIN.REST_URL.
+
+        Returns:
+            list: cookie dicts in the WebDriver cookie format.
+        '''
+
+        kwargs['cache'] = False
+        self.get(relative_url, **kwargs)
+
+        cookies = []
+        for cookie in self.session.cookies:
+            item = {
+                'name': cookie.name,
+                'value': cookie.value,
+                'domain': cookie.domain,
+                'path': cookie.path or '/',
+                'secure': bool(cookie.secure),
+                'httpOnly': cookie.has_nonstandard_attr('HttpOnly'),
+            }
+            if cookie.expires is not None:
+                item['expiry'] = int(cookie.expires)
+            cookies.append(item)
+        return cookies
+
+    def clear_cache(self):
+        '''This routine drops every cached GET response.'''
+
+        self._cache.clear()
+
+    def __getBaseURL(self, apiVersion):
+        '''
+        Private Method returning the base URL of <apiVersion>
+
+        Args:
+            :apiVersion (str): key of API.VERSION_URL_MAP
+
+        Returns:
+          str: base URL.
+        '''
+
+        baseURL = self._baseURLs.get(apiVersion)
+        if baseURL is None:
+            if apiVersion not in API.VERSION_URL_MAP:
+                raise ValueError('apiVersion {} is invalid'.format(apiVersion))
+
+            baseURL = self._baseURLs[apiVersion] = 'https://{0}:{1}{2}'.format(
+                self.ip, self.port, API.VERSION_URL_MAP[apiVersion]
+            )
+        return baseURL
+
     def post(self, relative_url, **kwargs):
         '''This routine is used to invoke POST call for REST API.
 
         Args:
             :relative_url(str): Relative URL for the particular API call.
-            :kwargs headers(str, optional): Custom headers for REST call.
+            :kwargs headers(str, optional): Custom headers for REST call,
+                                            merged over the instance headers.
             :kwargs payload (str, optional): payload to be send for REST call.
 
         Returns:
@@ -66,8 +192,12 @@ class REST(object):
 
         Args:
             :relative_url(str): Relative URL for the particular API call.
-            :kwargs headers(str, optional): Custom headers for REST call.
+            :kwargs headers(str, optional): Custom headers for REST call,
+                                            merged over the instance headers.
             :kwargs payload (str, optional): payload to be send for REST call.
+            :kwargs cache (bool, optional): Serve from / store in the response
+                                            cache. Default: instance setting.
+            :kwargs cache_ttl (int, optional): Secs to cache this response.
 
         Returns:
             str: response text.
@@ -81,7 +211,8 @@ class REST(object):
 
         Args:
             :relative_url(str): Relative URL for the particular API call.
-            :kwargs headers(str, optional): Custom headers for REST call.
+            :kwargs headers(str, optional): Custom headers for REST call,
+                                            merged over the instance headers.
             :kwargs payload (str, optional): payload to be send for REST call.
 
         Returns:
@@ -96,7 +227,8 @@ class REST(object):
 
         Args:
             :relative_url(str): Relative URL for the particular API call.
-            :kwargs headers(str, optional): Custom headers for REST call.
+            :kwargs headers(str, optional): Custom headers for REST call,
+                                            merged over the instance headers.
             :kwargs payload (str, optional): payload to be send for REST call.
 
         Returns:
@@ -111,7 +243,8 @@ class REST(object):
 
         Args:
             :relative_url (str): Relative URL for the particular API call.
-            :kwargs headers (str, optional): Custom headers for REST call.
+            :kwargs headers (str, optional): Custom headers for REST call,
+                                             merged over the instance headers.
             :kwargs payload (str, optional): payload to be send for REST call.
 
         Returns:
@@ -135,49 +268,85 @@ class REST(object):
         '''
 
         apiVersion = kwargs.pop('apiVersion', API.DEFAULT)
-        if apiVersion not in API.VERSION_URL_MAP.keys():
-            raise ValueError('apiVersion {} is invalid'.format(apiVersion))
-
-        URL = API.VERSION_URL_MAP.get(apiVersion)
-        self.baseURL = 'https://{0}:{1}{2}'.format(
-            self.ip, self.port, URL
-        )
+        self.baseURL = self.__getBaseURL(apiVersion)
 
         mainURI = '{0}{1}'.format(self.baseURL, relative_url)
-        headers = kwargs.pop('headers', {'content-type': 'application/json'})
+        headers = kwargs.pop('headers', None)
         verify = kwargs.pop('verify', False)
-        payload = kwargs.pop('payload', {})
-        payload = json.dumps(payload, indent=4) if payload else {}
-        auth = (self.username, self.password)
+        rawPayload = kwargs.pop('payload', {})
+        payload = json.dumps(rawPayload) if rawPayload else {}
         timeout = kwargs.pop('timeout', 480)
         stream = kwargs.pop('stream', False)
         params = kwargs.pop('params', {})
         operation = kwargs.pop('operation')
-        methodToCall = getattr(requests, operation)
+        session = self.session
+        session.cookies.clear()
+        methodToCall = getattr(session, operation)
+        useCache = kwargs.pop('cache', self.cache_enabled)
+        cacheTTL = kwargs.pop('cache_ttl', None)
+
+        cacheKey = entry = None
+        if operation == 'get' and useCache and not stream:
+            cacheKey = self._cache.key(apiVersion, relative_url, params)
+            entry = self._cache.get(cacheKey)
+            if entry is not None and entry.is_fresh():
+                LOG.url('[{0}]: {1}'.format(LOG.yellow('CACHED GET'), mainURI))
+                return self.__decode(entry.content)
+
+            if entry is not None and entry.etag:
+                headers = dict(headers or {})
+                headers['If-None-Match'] = entry.etag
 
         LOG.url('[{0}]: {1}'.format(LOG.yellow(operation.upper()), mainURI))
 
         if payload:
-            LOG.payload("{}".format(payload))
+            LOG.payload(lambda: LOG.truncate(json.dumps(rawPayload, indent=4)))
 
         response = methodToCall(
             mainURI, headers=headers, verify=verify, data=payload,
-            auth=auth, timeout=timeout, stream=stream, params=params
+            timeout=timeout, stream=stream, params=params
         )
 
         LOG.status(response.status_code)
 
+        if operation != 'get':
+            # a write makes every cached read of the resource suspect
+            self._cache.invalidate(apiVersion, relative_url)
+
+        elif cacheKey is not None and entry is not None and \
+                response.status_code == 304:
+            self._cache.refresh(cacheKey, cacheTTL)
+            return self.__decode(entry.content)
+
         # raise exception on failure
         response.raise_for_status()
 
-        if response.status_code != 204 and not stream:
-            LOG.response(json.dumps(json.loads(response.content), indent=4))
+        if cacheKey is not None:
+            self._cache.put(
+                cacheKey, response.content, response.headers.get('ETag'),
+                cacheTTL
+            )
 
         if stream:
             return response
 
-        elif response.text is not u'':
-            return response.json()
+        # parse once, serialize for the log only if RESPONSE is enabled
+        result = response.json() if response.text != '' else response.text
+        if response.status_code != 204:
+            LOG.response(lambda: LOG.truncate(json.dumps(result, indent=4)))
+
+        return result
+
+    @staticmethod
+    def __decode(content):
+        '''
+        Private Method decoding a cached response body like a live one.
+
+        Args:
+            :content (bytes): raw response body
+
+        Returns:
+          str: Response text or parsed json.
+        '''
 
-        else:
-            return response.text
+        return json.loads(content) if content else ''
@@ -11,3 +11,13 @@ class Singleton(type):
             cls._instancesDict[cls] = super().__call__(*args, **kwargs)
 
         return cls._instancesDict[cls]
+
+    def new_instance(cls, *args, **kwargs):
+        """build a fresh instance which bypasses the singleton cache"""
+
+        return super().__call__(*args, **kwargs)
+
+    def set_instance(cls, instance):
+        """make <instance> the one returned by subsequent cls() calls"""
+
+        cls._instancesDict[cls] = instance
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+# pylint: disable=redefined-outer-name
+
+'''conftest for the helper unit tests running on the fake driver'''
+
+import collections
+import os
+
+import pytest
+
+import command_counter
+from fake_webdriver import FakeDOM, FakeDriver, FakeElement
+from webdriver import Selenium
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(items):
+    '''marks the tests of this folder so that the UI run can deselect them'''
+    for item in items:
+        if str(item.fspath).startswith(TESTS_DIR + os.sep):
+            item.add_marker(pytest.mark.fake_driver)
+
+
+@pytest.fixture
+def dom():
+    '''
+    Returns:
+        FakeDOM: empty page model
+    '''
+    return FakeDOM()
+
+
+@pytest.fixture
+def driver(dom):
+    '''
+    Returns:
+        FakeDriver: chrome like fake driver on <dom>
+    '''
+    return FakeDriver(dom)
+
+
+@pytest.fixture
+def selenium(driver):
+    '''
+    Returns:
+        Selenium: session attached to <driver>, with a short implicit wait
+    '''
+    session = Selenium.new_instance(driver=driver, login=False)
+    session.IMPLICIT_WAIT = 0.2
+    return session
+
+
+@pytest.fixture
+def element(dom):
+    '''
+    Returns:
+        callable: adds a FakeElement to <dom> under a locator and returns it,
+                  element(locator, tag='div', **kwargs)
+    '''
+
+    def add(locator, tag='div', **kwargs):
+        return dom.add(locator, FakeElement(tag, **kwargs))
+
+    return add
+
+
+@pytest.fixture
+def commands(selenium):  # pylint: disable=unused-argument
+    '''
+    Returns:
+        callable: returns the WebDriver commands by name sent since the
+                  session was set up, or since the previous call
+    '''
+    last = [collections.Counter(command_counter.COMMANDS.commands)]
+
+    def sent():
+        current = collections.Counter(command_counter.COMMANDS.commands)
+        delta = current - last[0]
+        last[0] = current
+        return delta
+
+    return sent
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+'''tests of Click.button and its click strategies'''
+
+import threading
+import time
+
+import pytest
+from selenium.common.exceptions import ElementClickInterceptedException, \
+    NoSuchElementException
+from selenium.webdriver.common.by import By
+
+
+BUTTON = (By.ID, 'save')
+
+
+def later(secs, action):
+    '''runs <action> from another thread after <secs>, like a page timer'''
+    timer = threading.Timer(secs, action)
+    timer.start()
+    return timer
+
+
+def test_button_clicks_natively(selenium, element, commands):
+    button = element(BUTTON, 'button')
+
+    selenium.button(BUTTON)
+
+    assert button.clicks == 1
+    assert commands()['clickElement'] == 1
+
+
+def test_button_waits_for_cover_to_go(selenium, element, commands):
+    button = element(BUTTON, 'button', obscured=True)
+
+    def uncover():
+        button.obscured = False
+
+    later(selenium.IMPLICIT_WAIT, uncover)
+    selenium.button(BUTTON, timeout=10)
+
+    assert button.clicks == 1
+    assert commands()['clickElement'] == 1
+
+
+def test_button_clicks_covered_element_through_js_at_timeout(selenium,
+                                                             element,
+                                                             commands):
+    button = element(BUTTON, 'button', obscured=True)
+
+    selenium.button(BUTTON, timeout=0.5)
+
+    assert button.clicks == 1
+    assert commands()['clickElement'] == 0
+
+
+def test_button_falls_back_to_js_click_when_intercepted(selenium, element,
+                                                         commands):
+    def intercept_once(clicked):
+        if clicked.clicks == 1:
+            raise ElementClickInterceptedException('covered by a toast')
+
+    button = element(BUTTON, 'button', on_click=intercept_once)
+
+    selenium.button(BUTTON)
+
+    assert button.clicks == 2
+    assert commands()['clickElement'] == 1
+
+
+def test_button_waits_for_present_element_to_enable(selenium, element):
+    button = element(BUTTON, 'button', enabled=False)
+
+    def enable():
+        button.enabled = True
+
+    later(selenium.IMPLICIT_WAIT * 3, enable)
+    selenium.button(BUTTON, timeout=10)
+
+    assert button.clicks == 1
+
+
+def test_button_scrolls_to_missing_element_after_implicit_wait(selenium,
+                                                               element):
+    start = time.monotonic()
+    later(selenium.IMPLICIT_WAIT * 2, lambda: element(BUTTON, 'button'))
+
+    selenium.button(BUTTON, timeout=180)
+
+    assert selenium.driver.find_element(*BUTTON).clicks == 1
+    assert time.monotonic() - start < 5
+
+
+def test_button_search_for_missing_element_keeps_to_timeout(selenium):
+    start = time.monotonic()
+
+    with pytest.raises(NoSuchElementException):
+        selenium.button(BUTTON, timeout=1)
+
+    assert time.monotonic() - start < 3
+
+
+def test_button_raises_for_element_that_stays_disabled(selenium, element):
+    element(BUTTON, 'button', enabled=False)
+
+    with pytest.raises(NoSuchElementException):
+        selenium.button(BUTTON, timeout=0.5)
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+'''tests of the dropdown option reads and their cache'''
+
+import pytest
+
+from utils import set_locator
+import webdriver_pf as WD_PF
+
+
+OWNERS = ['admin', 'operator', 'viewer']
+
+
+@pytest.fixture
+def arrow(element):
+    '''
+    Returns:
+        FakeElement: arrow of the 'Owner' dropdown, opening its menu
+    '''
+
+    def open_menu(clicked):
+        element(WD_PF.DROPDOWN.SELECT_OPTIONS_XPATH)
+        for index, owner in enumerate(OWNERS):
+            element(WD_PF.DROPDOWN.SELECT_OPTION, text=owner, attributes={
+                'data-value': owner,
+                'class': 'Select-option' + (' is-disabled' if index == 2
+                                            else ''),
+            })
+
+    locator = set_locator(
+        WD_PF.DROPDOWN.SELECT_ARROW_NTH_XPATH, ('Owner', '1')
+    )
+    return element(locator, on_click=open_menu)
+
+
+def test_get_options_reads_label_value_and_state(selenium, arrow):
+    options = selenium.get_options('Owner')
+
+    assert [option['label'] for option in options] == OWNERS
+    assert [option['value'] for option in options] == OWNERS
+    assert [option['disabled'] for option in options] == [False, False, True]
+    assert arrow.clicks == 1
+
+
+def test_get_options_closes_the_menu(selenium, dom, arrow):
+    selenium.get_options('Owner')
+
+    assert not dom.find(*WD_PF.DROPDOWN.SELECT_OPTIONS_XPATH)
+
+
+def test_cached_options_are_reused_while_valid(selenium, arrow, commands):
+    selenium.get_options('Owner')
+    commands()
+
+    assert selenium.get_all_options('Owner') == OWNERS
+    assert arrow.clicks == 1
+    assert sum(commands().values()) == 1
+
+
+def test_changed_dropdown_is_read_again(selenium, driver, arrow):
+    selenium.get_options('Owner')
+    # the page flags every token dirty
+    driver.option_tokens.clear()
+
+    assert selenium.get_all_options('Owner') == OWNERS
+    assert arrow.clicks == 2
+
+
+def test_options_are_read_again_after_navigation(selenium, arrow):
+    selenium.get_options('Owner')
+    selenium.navigate('https://example/apps')
+
+    selenium.get_options('Owner')
+    assert arrow.clicks == 2
+
+
+def test_refresh_reopens_the_menu(selenium, arrow):
+    selenium.get_options('Owner')
+    selenium.get_options('Owner', refresh=True)
+
+    assert arrow.clicks == 2
+
+
+def test_get_all_options_takes_timeout_second(selenium, arrow):
+    # index comes after timeout so that older positional calls keep working
+    assert selenium.get_all_options('Owner', 60) == OWNERS
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+'''tests of the element cache behind Browser.locate'''
+
+from selenium.webdriver.common.by import By
+
+
+LABEL = (By.ID, 'label')
+CHECKBOX = (By.ID, 'enabled')
+
+
+def test_element_cache_only_keeps_elements_within_a_scope(selenium, element):
+    element(LABEL, 'span', text='Ready')
+
+    selenium.wait_until_element_present(LABEL, 1)
+    assert len(selenium.element_cache) == 0
+
+    with selenium.element_cache.scope():
+        selenium.wait_until_element_present(LABEL, 1)
+        with selenium.element_cache.scope():
+            assert selenium.get_text(LABEL) == 'Ready'
+        assert len(selenium.element_cache) == 1
+
+    assert len(selenium.element_cache) == 0
+
+
+def test_element_cache_reuses_element_within_a_scope(selenium, element,
+                                                     commands):
+    element(LABEL, 'span', text='Ready')
+
+    with selenium.element_cache.scope():
+        selenium.wait_until_element_present(LABEL, 1)
+        commands()
+        assert selenium.get_text(LABEL) == 'Ready'
+
+    sent = commands()
+    assert sent['findElement'] == 0
+    assert sent['executeAsyncScript'] == 0
+
+
+def test_stale_cached_element_is_relocated(selenium, element, dom):
+    old = element(LABEL, 'span', text='Ready')
+
+    with selenium.element_cache.scope():
+        selenium.wait_until_element_present(LABEL, 1)
+        dom.remove(old)
+        element(LABEL, 'span', text='Done')
+
+        assert selenium.get_text(LABEL) == 'Done'
+
+
+def test_element_replaced_outside_a_scope_is_not_reused(selenium, element,
+                                                        dom):
+    old = element(LABEL, 'span', text='Ready')
+    assert selenium.get_text(LABEL) == 'Ready'
+
+    # re-rendered: the old node stays attached but no longer matches
+    dom.remove(old)
+    old.attached = True
+    element(LABEL, 'span', text='Done')
+
+    assert selenium.get_text(LABEL) == 'Done'
+
+
+def test_toggle_checkbox_drops_its_scope(selenium, element):
+    checkbox = element(CHECKBOX, 'input', value='false')
+
+    selenium.toggle_checkbox(CHECKBOX, True)
+
+    assert checkbox.clicks == 1
+    assert len(selenium.element_cache) == 0
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+'''tests of the fake driver the helper tests run on'''
+
+import threading
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException, \
+    StaleElementReferenceException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+
+from fake_webdriver import FakeDOM, FakeDriver, FakeElement
+
+
+NAME = (By.ID, 'name')
+
+
+def test_finds_only_attached_elements(driver, element, dom):
+    field = element(NAME, 'input')
+
+    assert driver.find_element(*NAME) is field
+    dom.remove(field)
+    assert driver.find_elements(*NAME) == []
+    with pytest.raises(NoSuchElementException):
+        driver.find_element(*NAME)
+
+
+def test_removed_element_goes_stale(driver, element, dom):
+    field = element(NAME, 'input')
+    driver.find_element(*NAME)
+    dom.remove(field)
+
+    with pytest.raises(StaleElementReferenceException):
+        field.send_keys('entity')
+
+
+def test_implicit_wait_is_honored_on_request(dom):
+    driver = FakeDriver(dom, honor_implicit_wait=True)
+    driver.implicitly_wait(5)
+    field = FakeElement('input')
+    threading.Timer(0.1, lambda: dom.add(NAME, field)).start()
+
+    assert driver.find_element(*NAME) is field
+
+
+def test_navigation_rebuilds_the_page_through_the_loader():
+    dom = FakeDOM(lambda page, url: page.add(NAME, FakeElement(text=url)))
+    driver = FakeDriver(dom)
+
+    driver.get('https://example/apps')
+    first = driver.find_element(*NAME)
+    driver.get('https://example/login')
+
+    assert not first.attached
+    assert driver.find_element(*NAME).text == 'https://example/login'
+
+
+def test_typed_keys_edit_the_value(driver, element):
+    field = element(NAME, 'input', value='abc')
+
+    driver.find_element(*NAME).send_keys(Keys.BACK_SPACE + 'd')
+
+    assert field.value == 'abd'
+
+
+def test_devtools_commands_need_cdp(dom):
+    assert 'send_command' in FakeDriver(dom).command_executor._commands
+    assert 'send_command' not in \
+        FakeDriver(dom, cdp=False).command_executor._commands
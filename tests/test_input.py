@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+'''tests of Input.textbox, Input.fill_form and Selenium.script_text'''
+
+import pytest
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+
+import constants
+from fake_webdriver import FakeDriver
+import webdriver_pf as WD_PF
+from webdriver import Selenium
+
+
+NAME = (By.ID, 'name')
+ENABLED = (By.ID, 'enabled')
+KIND = (By.ID, 'kind')
+UPLOAD = (By.ID, 'upload')
+EDITOR = (By.ID, 'editor')
+
+LONG_TEXT = 'x' * constants.FAST_INPUT.THRESHOLD
+
+
+def test_textbox_types_short_text(selenium, element, commands):
+    field = element(NAME, 'input', value='old')
+
+    selenium.textbox('entity', NAME)
+
+    assert field.value == 'entity'
+    sent = commands()
+    assert sent['sendKeysToElement'] >= 1
+    assert sent['send_command'] == 0
+
+
+def test_textbox_inserts_long_text_through_devtools(selenium, element,
+                                                    commands):
+    field = element(NAME, 'input', value='old')
+
+    selenium.textbox(LONG_TEXT, NAME)
+
+    assert field.value == LONG_TEXT
+    sent = commands()
+    assert sent['send_command'] == 1
+    assert sent['sendKeysToElement'] == 0
+
+
+def test_textbox_inserts_after_kept_value(selenium, element):
+    field = element(NAME, 'input', value='abc')
+
+    selenium.textbox('def', NAME, clear=False, fast=True)
+
+    assert field.value == 'abcdef'
+
+
+def test_textbox_types_when_insert_is_rejected(selenium, element, commands):
+    field = element(NAME, 'input', value='ab', attributes={'maxlength': '4'})
+
+    selenium.textbox('cdef', NAME, clear=False, fast=True)
+
+    # the fake does not apply maxlength to typed keys
+    assert field.value == 'abcdef'
+    assert commands()['sendKeysToElement'] >= 1
+
+
+def test_textbox_types_long_text_with_keys(selenium, element, commands):
+    field = element(NAME, 'input')
+
+    selenium.textbox(LONG_TEXT + Keys.ENTER, NAME)
+
+    assert field.value == LONG_TEXT
+    assert commands()['send_command'] == 0
+
+
+def test_textbox_types_without_devtools(dom, element, commands):
+    selenium = Selenium.new_instance(
+        driver=FakeDriver(dom, cdp=False), login=False
+    )
+    field = element(NAME, 'input')
+    commands()
+
+    selenium.textbox(LONG_TEXT, NAME)
+
+    assert field.value == LONG_TEXT
+    assert commands()['send_command'] == 0
+
+
+def test_fill_form_sets_native_fields_in_one_script(selenium, element,
+                                                    commands):
+    name = element(NAME, 'input')
+    enabled = element(ENABLED, 'input', attributes={'type': 'checkbox'})
+    kind = element(KIND, 'select', options=[
+        ('vm', 'Virtual machine'), ('ct', 'Container')
+    ])
+
+    selenium.fill_form({
+        NAME: 'entity', ENABLED: True, KIND: 'Container',
+    })
+
+    assert name.value == 'entity'
+    assert enabled.attributes['checked'] == 'true'
+    assert kind.value == 'ct'
+    sent = commands()
+    assert sent['sendKeysToElement'] == 0
+    assert sent['clickElement'] == 0
+
+
+def test_fill_form_leaves_checkbox_in_desired_state(selenium, element):
+    enabled = element(ENABLED, 'input', attributes={
+        'type': 'checkbox', 'checked': 'true'
+    })
+
+    selenium.fill_form({ENABLED: 'true'})
+
+    assert enabled.attributes['checked'] == 'true'
+    assert enabled.clicks == 0
+
+
+def test_fill_form_refuses_to_uncheck_radio(selenium, element):
+    element(ENABLED, 'input', attributes={'type': 'radio', 'checked': 'true'})
+
+    with pytest.raises(ValueError):
+        selenium.fill_form({ENABLED: False})
+
+
+def test_fill_form_routes_keys_files_and_dropdowns(selenium, element,
+                                                  monkeypatch):
+    name = element(NAME, 'input')
+    upload = element(UPLOAD, 'input', attributes={'type': 'file'})
+    selected = []
+    monkeypatch.setattr(selenium, 'select', lambda label, value, **kwargs: (
+        selected.append((label, value, kwargs['index']))
+    ))
+
+    selenium.fill_form({
+        'Project': 'default',
+        ('Owner', 2): 'admin',
+        NAME: 'entity' + Keys.ENTER,
+        UPLOAD: '/tmp/blueprint.json',
+    })
+
+    assert selected == [('Project', 'default', 1), ('Owner', 'admin', 2)]
+    assert name.value == 'entity'
+    assert upload.value == '/tmp/blueprint.json'
+
+
+def test_script_text_transfers_in_chunks(selenium, element, monkeypatch,
+                                         commands):
+    editor = element(EDITOR)
+    monkeypatch.setattr(constants.FAST_INPUT, 'CHUNK_SIZE', 4)
+    code = 'echo "héllo 😀"\r\nexit 0\r'
+
+    selenium.script_text(EDITOR, code)
+
+    assert editor.value == 'echo "héllo 😀"\nexit 0\n'
+    chunks = -(-len(editor.value) // 4)
+    assert commands()['executeScript'] == chunks
+
+
+def test_script_text_retries_and_raises_on_hash_mismatch(selenium, element,
+                                                         driver):
+    element(EDITOR)
+    transfer = driver.scripts[WD_PF.JS.CM_TRANSFER]
+    calls = []
+
+    def corrupt(target, chunk, *args):
+        calls.append(chunk)
+        return transfer(target, chunk[:-1], *args)
+
+    driver.scripts[WD_PF.JS.CM_TRANSFER] = corrupt
+
+    with pytest.raises(RuntimeError):
+        selenium.script_text(EDITOR, 'exit 0')
+
+    assert len(calls) == 2
+
+
+def test_text_digest_counts_utf16_units(selenium):
+    length, _ = selenium.text_digest('a😀')
+
+    assert length == 3
+    assert selenium.text_digest('abc') != selenium.text_digest('abd')
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+'''tests of the bulk DOM reads of Label'''
+
+import pytest
+from selenium.webdriver.common.by import By
+
+
+ROWS = (By.CSS_SELECTOR, '.row')
+
+
+def test_read_many_reads_every_element_in_one_script(selenium, element,
+                                                     commands):
+    for index in range(3):
+        element(ROWS, text='row {}'.format(index),
+                attributes={'data-id': str(index)})
+
+    assert selenium.read_many(ROWS) == ['row 0', 'row 1', 'row 2']
+    assert selenium.read_many(ROWS, ['text', 'attr:data-id']) == [
+        ['row 0', '0'], ['row 1', '1'], ['row 2', '2']
+    ]
+    assert commands()['executeScript'] == 2
+
+
+def test_get_attribute_of_multiple_elements(selenium, element):
+    for index in range(2):
+        element(ROWS, attributes={'data-id': str(index)})
+
+    assert selenium.get_attribute('data-id', ROWS, True) == ['0', '1']
+
+
+def test_read_many_rejects_unknown_field(selenium, element):
+    element(ROWS)
+
+    with pytest.raises(ValueError):
+        selenium.read_many(ROWS, 'style')
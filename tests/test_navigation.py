@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+'''tests of the clean page tracking behind the page fixtures'''
+
+from selenium.webdriver.common.by import By
+
+from fake_webdriver import FakeDriver
+from webdriver import Selenium
+
+
+NAME = (By.ID, 'name')
+
+
+def test_untouched_page_stays_clean_without_a_command(selenium, commands):
+    selenium.navigation.mark_clean()
+    commands()
+
+    assert selenium.navigation.is_clean()
+    assert sum(commands().values()) == 0
+
+
+def test_commands_of_another_session_keep_the_shortcut(selenium, dom,
+                                                      commands):
+    selenium.navigation.mark_clean()
+    other = Selenium.new_instance(driver=FakeDriver(dom), login=False)
+    commands()
+    other.driver.find_elements(*NAME)
+
+    assert selenium.navigation.is_clean()
+    assert commands()['executeScript'] == 0
+
+
+def test_page_is_fingerprinted_after_a_command(selenium, commands):
+    selenium.navigation.mark_clean()
+    selenium.driver.find_elements(*NAME)
+    commands()
+
+    assert selenium.navigation.is_clean()
+    assert commands()['executeScript'] == 1
+
+
+def test_typing_dirties_the_page(selenium, element):
+    element(NAME, 'input')
+    selenium.navigation.mark_clean()
+
+    selenium.textbox('entity', NAME)
+
+    assert not selenium.navigation.is_clean()
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+'''tests of Wait.wait_for_any and Wait.wait_for_all'''
+
+import threading
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+
+
+APP = (By.ID, 'app')
+LOGIN = (By.ID, 'login')
+SPINNER = (By.ID, 'spinner')
+
+
+def test_wait_for_any_returns_first_met_locator(selenium, element):
+    login = element(LOGIN, 'form')
+
+    assert selenium.wait_for_any([APP, LOGIN], timeout=1) == (1, login)
+
+
+def test_wait_for_any_returns_none_for_conditions_without_element(selenium,
+                                                                  element):
+    element(APP)
+
+    assert selenium.wait_for_any(
+        [SPINNER, APP], conditions=['absent', 'visible'], timeout=1
+    ) == (0, None)
+
+
+def test_wait_for_any_sees_element_rendered_later(selenium, element):
+    threading.Timer(0.2, lambda: element(APP)).start()
+
+    index, app = selenium.wait_for_any([APP, LOGIN], timeout=5)
+    assert (index, app) == (0, selenium.driver.find_element(*APP))
+
+
+def test_wait_for_any_times_out(selenium):
+    with pytest.raises(TimeoutException):
+        selenium.wait_for_any([APP, LOGIN], timeout=0.3)
+
+
+def test_wait_for_all_returns_every_element(selenium, element):
+    app = element(APP, text='Welcome admin')
+    login = element(LOGIN, 'form')
+
+    assert selenium.wait_for_all([APP, LOGIN], timeout=1) == [app, login]
+    # text and absent checks hold without handing back an element
+    assert selenium.wait_for_all(
+        [APP, SPINNER], conditions=[('text', 'admin'), 'absent'], timeout=1
+    ) == [None, None]
+
+
+def test_wait_for_all_times_out_if_one_is_missing(selenium, element):
+    element(APP)
+
+    with pytest.raises(TimeoutException):
+        selenium.wait_for_all([APP, LOGIN], timeout=0.3)
+
+
+def test_one_text_condition_applies_to_every_locator(selenium, element):
+    element(APP, text='admin')
+    element(LOGIN, text='admin')
+
+    assert len(selenium.wait_for_all(
+        [APP, LOGIN], conditions=('text', 'admin'), timeout=1
+    )) == 2
+
+
+@pytest.mark.parametrize('conditions', [
+    ('visible', 'present'),
+    ['visible'],
+    [('visible', 'present'), 'present'],
+])
+def test_ambiguous_conditions_are_rejected(selenium, conditions):
+    with pytest.raises(ValueError):
+        selenium.wait_for_any([APP, LOGIN], conditions=conditions, timeout=1)
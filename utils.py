@@ -26,6 +26,22 @@ def manual(test):
     return test
 
 
+def max_driver_commands(limit):
+    '''
+    This decorator fails a test case that sends more than <limit> WebDriver
+    commands to the browser.
+    Args:
+        limit (int): WebDriver command budget of the test.
+    Returns:
+        (object): The decorator.
+    '''
+
+    def budget(test):
+        test.max_driver_commands = limit
+        return test
+    return budget
+
+
 def get_unique_id(length=10):
     '''
     return unique id of specified length
@@ -3,24 +3,38 @@
 
 # pylint: disable=broad-except
 
+import array
+import contextlib
 import os
+import sys
 import time
+import uuid
 
 from pyvirtualdisplay import Display as PyVTDisplay
 from selenium import webdriver
 from selenium.common.exceptions import NoSuchElementException, TimeoutException, \
-    StaleElementReferenceException, InvalidElementStateException
+    StaleElementReferenceException, InvalidElementStateException, \
+    WebDriverException
 from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support.select import Select
 
+from auth_state import AuthStateStore
+import command_counter
 import constants
+import dom_wait
+import instrumentation
+from element_cache import ElementCache
 from logger import CustomLogger
+from navigation import NavigationTracker
+import polling
+from rest import REST
 from singleton import Singleton
 from utils import retries, set_locator, get_script_folder_path
-import webdriver as WD_PF
+import webdriver_pf as WD_PF
 
 
 LOG = CustomLogger(__name__)
@@ -29,16 +43,40 @@ LOG = CustomLogger(__name__)
 class BaseDriver(metaclass=Singleton):
     '''base driver class to initialize web driver'''
 
-    def __init__(self):
+    # default implicit wait in secs applied to the session
+    IMPLICIT_WAIT = 10
+
+    def __init__(self, driver=None):
         '''
         constructor for driver class
         Args:
-            :None:
+            :driver (WebDriver): backend to use instead of starting a browser,
+                                 e.g. fake_webdriver.FakeDriver
         '''
         self.driver = None
         self.display = None
         self.AC = None
-        self.setup_driver()
+        self._implicit_wait = None
+        self.element_cache = ElementCache()
+        # dropdown options by (label, index), see Dropdown.get_options
+        self.option_cache = {}
+        if driver is None:
+            self.setup_driver()
+        else:
+            self.attach_driver(driver)
+
+    def attach_driver(self, driver):
+        '''
+        Uses an already running <driver> as backend
+        Args:
+            driver (WebDriver): driver or any object implementing its API
+        '''
+        LOG.info('attaching webdriver backend {}'.format(type(driver).__name__))
+        self.driver = driver
+        self.AC = ActionChains(self.driver)
+        command_counter.install(self.driver)
+        self.prepare_session()
+        self.get_into_login_page()
 
     def setup_driver(self):
         LOG.info('setting up webdriver and starting browser')
@@ -67,8 +105,10 @@ class BaseDriver(metaclass=Singleton):
                 "safebrowsing.enabled": True
             }
             chrome_options.add_experimental_option("prefs", preferences)
+            # without CHROME_PATH selenium manager looks up chromedriver
             self.driver = webdriver.Chrome(
-                os.getenv("CHROME_PATH"), options=chrome_options
+                service=ChromeService(executable_path=os.getenv("CHROME_PATH")),
+                options=chrome_options
             )
 
             # self.driver = webdriver.Remote('http://localhost:32769/wd/hub', chrome_options.to_capabilities())
@@ -95,19 +135,86 @@ class BaseDriver(metaclass=Singleton):
             self.driver = webdriver.Firefox(firefox_profile=fp)
             self.driver.fullscreen_window()
 
+        command_counter.install(self.driver)
+        self.prepare_session()
         self.get_into_login_page()
         LOG.info('driver setup complete and browser is instantiated')
 
+    def prepare_session(self):
+        '''
+        Hook run once the browser is up, before the first page load
+        '''
+
+    def supports_cdp(self):
+        '''
+        Returns:
+            bool: True if the driver can send chrome devtools commands
+        '''
+
+        return 'send_command' in getattr(
+            self.driver.command_executor, '_commands', {}
+        )
+
     def get_into_login_page(self):
         url = self.get_url()
         LOG.info("loading url: {}".format(url))
-        self.driver.get(url)
+        self.navigate(url)
         self.driver.set_page_load_timeout(50)
-        self.driver.implicitly_wait(10)
+        self.set_implicit_wait(self.IMPLICIT_WAIT)
         self.driver.set_script_timeout(10)
 
+    def navigate(self, url):
+        '''
+        Loads <url>, dropping elements and options cached for the previous
+        page
+        Args:
+            url (str): url to load
+        '''
+
+        self.element_cache.clear()
+        self.option_cache.clear()
+        self.driver.get(url)
+
+    def set_implicit_wait(self, seconds):
+        '''
+        Sets the session implicit wait, skipping the round trip if unchanged
+        Args:
+            seconds (int): implicit wait in seconds
+        '''
+
+        if seconds != self._implicit_wait:
+            self.driver.implicitly_wait(seconds)
+            self._implicit_wait = seconds
+
+    @contextlib.contextmanager
+    def implicit_wait(self, seconds):
+        '''
+        Scopes the session implicit wait to <seconds> and restores it after
+        Args:
+            seconds (int): implicit wait in seconds within the scope
+        '''
+
+        previous = self._implicit_wait
+        self.set_implicit_wait(seconds)
+        try:
+            yield
+        finally:
+            if previous is not None:
+                self.set_implicit_wait(previous)
+
+    def _wait(self, timeout, policy=None, ignored_exceptions=None):
+        '''
+        Returns:
+            PolicyWait: wait of <timeout> secs polling on <policy>
+        '''
+
+        return polling.PolicyWait(
+            self.driver, timeout, policy, ignored_exceptions
+        )
+
     def get_url(self):
-        return ('https://%s:%s' % (
+        # APP_URL points the helpers at another app, e.g. the benchmark one
+        return os.getenv('APP_URL') or ('https://%s:%s' % (
             constants.CREDS.IP, constants.CREDS.PORT
         ))
 
@@ -115,18 +222,38 @@ class BaseDriver(metaclass=Singleton):
 class Wait(BaseDriver):
     '''base wait class that implments selenium wait methods'''
 
-    def wait_until_element_present(self, element, timeout=300):
+    def _wait_in_page(self, checks, timeout, policy=None, mode='any'):
+        '''
+        Returns:
+            list: per check the matched element, True or False, once any /
+                  all of the (locator, condition[, text]) <checks> hold
+        Raises:
+            TimeoutException: if they do not hold within <timeout> secs
+        '''
+
+        return dom_wait.DomWait(
+            self.driver, timeout, policy,
+            polling_scope=lambda: self.implicit_wait(0)
+        ).until(checks, mode)
+
+    def wait_until_element_present(self, element, timeout=300, policy=None):
         '''
         Waits until element is present
         Args:
             element (tuple): Element locator
             timeout (int): timeout in seconds
+            policy (PollingPolicy): intervals of python side polling,
+                                    Default: polling.DEFAULT
+        Returns:
+            WebElement: the located element
         '''
 
         try:
-            WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located(element)
-            )
+            found = self._wait_in_page(
+                [(element, 'present')], timeout, policy
+            )[0]
+            self.element_cache.put(element, found)
+            return found
 
         except TimeoutException:
             LOG.error('failed to find element %s' % element[1])
@@ -135,33 +262,36 @@ class Wait(BaseDriver):
         except Exception:
             raise
 
-    def wait_until_element_not_present(self, element, timeout=300):
+    def wait_until_element_not_present(self, element, timeout=300,
+                                       policy=None):
         '''
         Waits until element is not present
         Args:
             element (tuple): Element locator
             timeout (int): timeout in seconds
+            policy (PollingPolicy): intervals of python side polling,
+                                    Default: polling.DEFAULT
         '''
         try:
-            WebDriverWait(self.driver, timeout).until_not(
-                EC.presence_of_element_located(element)
-            )
+            self._wait_in_page([(element, 'absent')], timeout, policy)
 
         except Exception:
             LOG.error("element %s is present" % element[1])
             raise
 
-    def wait_until_page_loads(self, page_start, timeout=300):
+    def wait_until_page_loads(self, page_start, timeout=300, policy=None):
         '''
         Waits until page is loaded
         Args:
             element (tuple): Element locator
             page_start (string): Page start string
             timeout (int): timeout in seconds
+            policy (PollingPolicy): intervals of python side polling,
+                                    Default: polling.DEFAULT
         '''
 
         try:
-            WebDriverWait(self.driver, timeout).until(
+            self._wait(timeout, policy).until(
                 lambda driver: driver.title.lower().startswith(page_start)
             )
 
@@ -169,12 +299,119 @@ class Wait(BaseDriver):
             LOG.error('failed to load page %s' % page_start)
             raise
 
-    def wait_until_element_visible(self, element, timeout=300):
+    @staticmethod
+    def _checks(locators, conditions):
+        '''
+        pairs <locators> with <conditions>: one condition, i.e. a str or a
+        ('text', text) tuple, for all of them or a list of one per locator
+        '''
+
+        def _check(locator, condition):
+            if isinstance(condition, str):
+                return (locator, condition)
+            if isinstance(condition, tuple) and len(condition) == 2 and \
+                    condition[0] == 'text':
+                return (locator,) + condition
+            raise ValueError(
+                'condition {} is neither a str nor a (\'text\', text) tuple, '
+                'pass per locator conditions as a list'.format(condition)
+            )
+
+        if not isinstance(conditions, list):
+            conditions = [conditions] * len(locators)
+        if len(conditions) != len(locators):
+            raise ValueError('{0} locators but {1} conditions'.format(
+                len(locators), len(conditions)
+            ))
+        return [
+            _check(locator, condition)
+            for locator, condition in zip(locators, conditions)
+        ]
+
+    def wait_for_any(self, locators, conditions='present', timeout=300,
+                     policy=None):
+        '''
+        Waits until any of <locators> meets its condition, checking all of
+        them in one evaluation per poll
+        Args:
+            locators (list): Element locators
+            conditions (str|tuple|list): condition of every locator or a
+                                         list of one per locator; 'present',
+                                         'absent', 'visible', 'invisible',
+                                         'clickable' or ('text', text)
+            timeout (int): timeout in seconds
+            policy (PollingPolicy): intervals of python side polling,
+                                    Default: polling.DEFAULT
+        Returns:
+            tuple: index of the first locator meeting its condition and its
+                   element, None for conditions without one
+        Raises:
+            TimeoutException
+        '''
+
+        try:
+            results = self._wait_in_page(
+                self._checks(locators, conditions), timeout, policy
+            )
+
+        except TimeoutException:
+            LOG.error('none of %s met its condition' % [
+                locator[1] for locator in locators
+            ])
+            raise
+
+        for index, result in enumerate(results):
+            if result:
+                if result is True:
+                    return index, None
+                self.element_cache.put(locators[index], result)
+                return index, result
+
+    def wait_for_all(self, locators, conditions='present', timeout=300,
+                     policy=None):
+        '''
+        Waits until all of <locators> meet their conditions, checking all of
+        them in one evaluation per poll
+        Args:
+            locators (list): Element locators
+            conditions (str|tuple|list): as for wait_for_any
+            timeout (int): timeout in seconds
+            policy (PollingPolicy): intervals of python side polling,
+                                    Default: polling.DEFAULT
+        Returns:
+            list: element of every locator, None for conditions without one
+        Raises:
+            TimeoutException
+        '''
+
+        try:
+            results = self._wait_in_page(
+                self._checks(locators, conditions), timeout, policy, mode='all'
+            )
+
+        except TimeoutException:
+            LOG.error('not all of %s met their conditions' % [
+                locator[1] for locator in locators
+            ])
+            raise
+
+        elements = []
+        for locator, result in zip(locators, results):
+            if result is True:
+                elements.append(None)
+            else:
+                self.element_cache.put(locator, result)
+                elements.append(result)
+        return elements
+
+    def wait_until_element_visible(self, element, timeout=300, policy=None):
         '''
         Waits until element is visible in timeout secs
         Args:
             element (tuple): Element locator
             timeout (int): timeout in seconds
+            policy (PollingPolicy): intervals of python side polling,
+                                    Default: polling.DEFAULT
         Raises:
             NoSuchElementException on failure
         '''
@@ -182,9 +419,7 @@ class Wait(BaseDriver):
         LOG.info("waiting for '%s' element to be visible: %s" % (element[1], timeout))
 
         try:
-            WebDriverWait(self.driver, timeout).until(
-                EC.visibility_of_element_located(element)
-            )
+            self._wait_in_page([(element, 'visible')], timeout, policy)
 
         except TimeoutException:
             LOG.error('element invisible: %s' % element[1])
@@ -193,12 +428,15 @@ class Wait(BaseDriver):
         except Exception:
             raise
 
-    def wait_until_element_not_visible(self, element, timeout=300):
+    def wait_until_element_not_visible(self, element, timeout=300,
+                                       policy=None):
         '''
         Waits until element is not visible in timeout secs
         Args:
             element (tuple): Element locator
             timeout (int): timeout in seconds
+            policy (PollingPolicy): intervals of python side polling,
+                                    Default: polling.DEFAULT
         Raises:
             Exception
         '''
@@ -206,28 +444,27 @@ class Wait(BaseDriver):
         LOG.info("waiting for '%s' element to be invisible: %s" % (element[1], timeout))
 
         try:
-            WebDriverWait(self.driver, timeout).until_not(
-                EC.visibility_of_element_located(element)
-            )
+            self._wait_in_page([(element, 'invisible')], timeout, policy)
 
         except Exception:
             LOG.error('element visible: %s' % element[1])
             raise
 
-    def wait_until_element_is_clickable(self, element, timeout=300):
+    def wait_until_element_is_clickable(self, element, timeout=300,
+                                        policy=None):
         '''
         Waits until element becomes clickable until timeout secs
         Args:
             element (tuple): Element locator
             timeout (int): timeout in seconds
+            policy (PollingPolicy): intervals of python side polling,
+                                    Default: polling.DEFAULT
         Raises:
             NoSuchElementException
         '''
 
         try:
-            WebDriverWait(self.driver, timeout).until(
-                EC.element_to_be_clickable(element)
-            )
+            self._wait_in_page([(element, 'clickable')], timeout, policy)
 
         except TimeoutException:
             LOG.warning('element %s is not clickable' % element[1])
@@ -236,21 +473,21 @@ class Wait(BaseDriver):
         except Exception:
             raise
 
-    def wait_for_text(self, element, text, timeout=300):
+    def wait_for_text(self, element, text, timeout=300, policy=None):
         '''
         Waits until text to be present in the element
         Args:
             element (tuple): Element locator
             text (string): Text to be present
             timeout (int): timeout in seconds
+            policy (PollingPolicy): intervals of python side polling,
+                                    Default: polling.DEFAULT
         Raises:
             NoSuchElementException
         '''
 
         try:
-            WebDriverWait(self.driver, timeout).until(
-                EC.text_to_be_present_in_element(element, text)
-            )
+            self._wait_in_page([(element, 'text', text)], timeout, policy)
 
         except TimeoutException:
             LOG.error('failed to find element %s' % element[1])
@@ -263,6 +500,16 @@ class Wait(BaseDriver):
 class Browser(Wait):
     '''base browser class that implments selenium browser methods'''
 
+    # scrollIntoView block and inline alignment of UI_SCROLL_POSITIONING
+    SCROLL_ALIGNMENT = {
+        constants.UI_SCROLL_POSITIONING.TOP_LEFT: ('start', 'start'),
+        constants.UI_SCROLL_POSITIONING.TOP_CENTER: ('start', 'center'),
+        constants.UI_SCROLL_POSITIONING.TOP_RIGHT: ('start', 'end'),
+        constants.UI_SCROLL_POSITIONING.BOTTOM_LEFT: ('end', 'start'),
+        constants.UI_SCROLL_POSITIONING.BOTTOM_CENTER: ('end', 'center'),
+        constants.UI_SCROLL_POSITIONING.BOTTOM_RIGHT: ('end', 'end'),
+    }
+
     def is_element_present(self, locator):
         '''
         method to return True if locator element is present on UI else False.
@@ -272,13 +519,7 @@ class Browser(Wait):
              boolean: True if element is present on UI else False.
         '''
 
-        try:
-            self.driver.find_element(*locator)
-
-        except Exception:
-            return False
-
-        return True
+        return self.count_elements(locator) > 0
 
     def is_element_absent(self, locator):
         '''
@@ -289,26 +530,42 @@ class Browser(Wait):
             boolean
         '''
 
+        return self.count_elements(locator) == 0
+
+    def count_elements(self, locator):
+        '''
+        Counts the elements matching <locator> right now, without waiting
+        Args:
+            locator(tuple): Web element locator
+        Returns:
+            int: number of matching elements
+        '''
+
         try:
-            self.driver.find_element(*locator)
+            return self.driver.execute_script(
+                WD_PF.JS.COUNT_ELEMENTS, locator[0], locator[1]
+            )
 
         except Exception:
-            return True
+            # locator the page can not evaluate, let webdriver decide
+            with self.implicit_wait(0):
+                return len(self.driver.find_elements(*locator))
 
-        return False
-
-    def is_visible(self, element, timeout=1):
+    def is_visible(self, element, timeout=1, policy=None):
         '''
         Return True if element is visible within 2 seconds, otherwise False
         Args:
             element (tuple): Element locator
             timeout (int) : Timeout secs for webdriver wait
+            policy (PollingPolicy): intervals of python side polling,
+                                    Default: polling.DEFAULT
         Returns:
             boolean
         '''
 
         try:
-            self.wait_until_element_visible(element, timeout)
+            with self.implicit_wait(0):
+                self.wait_until_element_visible(element, timeout, policy)
             return True
 
         except TimeoutException:
@@ -317,34 +574,39 @@ class Browser(Wait):
         except NoSuchElementException:
             return False
 
-    def is_not_visible(self, element, timeout=1):
+    def is_not_visible(self, element, timeout=1, policy=None):
         '''
         Return True or False if element is not visible within 2 seconds
         Args:
             element (tuple): Element locator
             timeout (int) : Timeout secs for webdriver wait
+            policy (PollingPolicy): intervals of python side polling,
+                                    Default: polling.DEFAULT
         Returns:
             boolean
         '''
 
         try:
-            self.wait_until_element_not_visible(element, timeout)
+            self.wait_until_element_not_visible(element, timeout, policy)
             return True
 
         except TimeoutException:
             return False
 
-    def is_element_clickable(self, element, timeout=2):
+    def is_element_clickable(self, element, timeout=2, policy=None):
         '''
         Return True or False if element is not clickable within 2 seconds
         Args:
             element (tuple): Element locator
             timeout (int) : Timeout secs for webdriver wait
+            policy (PollingPolicy): intervals of python side polling,
+                                    Default: polling.DEFAULT
         Returns:
             boolean
         '''
         try:
-            self.wait_until_element_is_clickable(element, timeout)
+            with self.implicit_wait(0):
+                self.wait_until_element_is_clickable(element, timeout, policy)
             return True
 
         except TimeoutException:
@@ -353,6 +615,21 @@ class Browser(Wait):
         except NoSuchElementException:
             return False
 
+    def probe_element(self, locator, scroll=False):
+        '''
+        Collects the state of an element in a single round trip
+        Args:
+            locator(tuple): Web element locator
+            scroll(bool): scroll the element into view if it is off screen
+        Returns:
+            dict: present, displayed, enabled, in_viewport, obscured, rect
+                  and the element itself when present
+        '''
+
+        return self.driver.execute_script(
+            WD_PF.JS.PROBE_ELEMENT, locator[0], locator[1], scroll
+        )
+
     def get_current_url(self):
         '''
         This routine returns current url of the browser
@@ -460,29 +737,145 @@ class Browser(Wait):
         Args:
             element(tuple): web element locator to which you want to scroll
         '''
-        element = self.driver.find_element(*element)
-        self.driver.execute_script("arguments[0].scrollIntoView();", element)
+        self.with_element(element, lambda found: self.driver.execute_script(
+            "arguments[0].scrollIntoView();", found
+        ))
+
+    def locate(self, locator, timeout=None):
+        '''
+        Returns the element for <locator>, reusing the one cached within
+        the current element_cache.scope()
+        Args:
+            locator(tuple): web element locator
+            timeout(int): secs to wait for presence, None for a plain find
+        Returns:
+            WebElement: located element
+        '''
+
+        element = self.element_cache.get(locator)
+        if element is None:
+            if timeout is None:
+                element = self.driver.find_element(*locator)
+                self.element_cache.put(locator, element)
+            else:
+                element = self.wait_until_element_present(locator, timeout)
+        return element
+
+    def with_element(self, locator, action, timeout=None):
+        '''
+        Runs <action> on the element for <locator>, relocating it once if
+        the cached element went stale
+        Args:
+            locator(tuple): web element locator
+            action(callable): called with the located WebElement
+            timeout(int): secs to wait for presence, None for a plain find
+        Returns:
+            return value of <action>
+        '''
 
-    def scroll_from_top(self, element, timeout=10):
+        try:
+            return action(self.locate(locator, timeout))
+
+        except StaleElementReferenceException:
+            instrumentation.METRICS.event('with_element', 'stale_relocate')
+            self.element_cache.discard(locator)
+            return action(self.locate(locator, timeout))
+
+    def scroll_from_top(self, element, timeout=10, position=None,
+                        scrollbar_identifier=None):
         '''
-        scroll the view to the <element> by searching it from top
+        scroll the view to the <element> by searching it from top; pages
+        down until it is rendered, scrolls it into <position> within its
+        scrollable ancestors and confirms it is visible, all in the page
         Args:
             element (tuple): web element locator to which you want to scroll
             timeout (int) : Timeout value for a wait
+            position (str): UI_SCROLL_POSITIONING value, Default: centered
+            scrollbar_identifier (tuple): locator of the nested scroll
+                                          container to search, Default: page
+        Returns:
+            WebElement: the visible element
         Raises:
             NoSuchElementException
         '''
 
+        block, inline = self.SCROLL_ALIGNMENT.get(
+            position, ('center', 'nearest')
+        )
+        container = self.driver.find_element(*scrollbar_identifier) \
+            if scrollbar_identifier else None
+
+        end = time.monotonic() + timeout
+        restart = True
+        while True:
+            remaining = max(0, end - time.monotonic())
+            try:
+                state = self.driver.execute_async_script(
+                    WD_PF.JS.SCROLL_TO, element[0], element[1], block, inline,
+                    container, restart,
+                    int(min(remaining, constants.DOM_WAIT.SLICE) * 1000)
+                )
+            except WebDriverException as exception:
+                LOG.debug("scroll search failed, stepping instead: {}".format(
+                    exception
+                ))
+                return self._scroll_from_top_stepwise(element, end)
+
+            restart = False
+            if state['visible']:
+                self.element_cache.put(element, state['element'])
+                return state['element']
+            if time.monotonic() >= end:
+                LOG.error("failed to find element {}".format(element[1]))
+                raise NoSuchElementException
+
+    def _scroll_from_top_stepwise(self, element, deadline):
+        '''
+        scroll_from_top from python, 250px per visibility check
+        '''
+
         self.driver.execute_script(
             "window.scrollTo(document.body.scrollHeight, 0);"
         )
 
-        timeout += time.time()
         while not self.is_visible(element, timeout=1):
             self.driver.execute_script("window.scrollBy(0, 250)")
-            if time.time() > timeout:
+            if time.monotonic() > deadline:
                 LOG.error("failed to find element {}".format(element[1]))
                 raise NoSuchElementException
+        return self.driver.find_element(*element)
+
+    def wait_for_settle(self, quiet_window=None, timeout=None):
+        '''
+        Waits until the page is quiet: no DOM mutation, pending fetch/XHR
+        or running finite animation for <quiet_window> secs. Requests
+        pending for over SETTLE.REQUEST_CUTOFF secs are not waited on
+        Args:
+            quiet_window (float): quiet secs, Default: SETTLE.QUIET_WINDOW
+            timeout (float): upper cap in secs, Default: SETTLE.TIMEOUT
+        Returns:
+            bool: True if the page settled before the cap
+        '''
+
+        if quiet_window is None:
+            quiet_window = constants.SETTLE.QUIET_WINDOW
+        if timeout is None:
+            timeout = constants.SETTLE.TIMEOUT
+
+        try:
+            settled = self.driver.execute_async_script(
+                WD_PF.JS.SETTLE, int(quiet_window * 1000), int(timeout * 1000),
+                int(constants.SETTLE.REQUEST_CUTOFF * 1000)
+            )
+
+        except Exception as exception:
+            # navigation while waiting tears the script down, nothing to wait on
+            LOG.debug("settle wait aborted: {}".format(exception))
+            return False
+
+        if not settled:
+            LOG.info("page did not settle within {} secs".format(timeout))
+        return bool(settled)
 
     def take_screenshot(self, test_name="test"):
         '''
@@ -502,6 +895,58 @@ class Browser(Wait):
 class Label(Browser):
     '''base click class that implments selenium label methods'''
 
+    # field kinds read_many understands
+    READ_FIELDS = ('text', 'attr', 'prop', 'css')
+
+    def read_many(self, locator, fields='text', timeout=180):
+        '''
+        This routine reads fields of every element matching <locator> in a
+        single round trip
+        Args:
+            locator (tuple): locator and locator type
+            fields (str|list): 'text', 'attr:<name>', 'prop:<name>' or
+                               'css:<name>', or a list of them
+            timeout (int): timeout in seconds for the first element
+        Returns:
+            list: value per element for a single field, otherwise a row with
+                  the value of every field per element
+        '''
+
+        single = isinstance(fields, str)
+        if single:
+            fields = [fields]
+        for field in fields:
+            if field.split(':', 1)[0] not in self.READ_FIELDS or \
+                    (field != 'text' and ':' not in field):
+                raise ValueError('invalid field {}'.format(field))
+
+        self.wait_until_element_present(locator, timeout)
+        try:
+            rows = self.driver.execute_script(
+                WD_PF.JS.READ_MANY, locator[0], locator[1], list(fields)
+            )
+
+        except WebDriverException as exception:
+            LOG.debug("bulk read failed, reading one by one: {}".format(
+                exception
+            ))
+            rows = [
+                [self._read_field(element, field) for field in fields]
+                for element in self.driver.find_elements(*locator)
+            ]
+
+        return [row[0] for row in rows] if single else rows
+
+    def _read_field(self, element, field):
+        kind, _, name = field.partition(':')
+        if kind == 'text':
+            return element.text
+        if kind == 'attr':
+            return element.get_attribute(name)
+        if kind == 'prop':
+            return element.get_property(name)
+        return element.value_of_css_property(name)
+
     def get_text(self, locator, timeout=180):
         '''
         This routine returns text from the label
@@ -512,16 +957,15 @@ class Label(Browser):
             str: text of the web element.
         '''
 
-        try:
-            self.wait_until_element_present(locator, timeout)
-            self.scroll_into_view(locator)
-            element = self.driver.find_element(*locator)
+        def _text(element):
             self.driver.execute_script(
                 "arguments[0].scrollIntoView();", element
             )
-
             return element.text
 
+        try:
+            return self.with_element(locator, _text, timeout)
+
         except TimeoutException:
             LOG.error("failed to find element {}".format(locator[1]))
             raise NoSuchElementException
@@ -543,18 +987,17 @@ class Label(Browser):
         '''
 
         try:
-            self.wait_until_element_present(locator, timeout)
             if is_multiple_attributes:
-                attributes = []
-                elements = self.driver.find_elements(*locator)
-                for element in elements:
-                    attributes.append(element.get_attribute(attribute))
-                return attributes
+                return self.read_many(locator, 'attr:' + attribute, timeout)
             else:
-                if not self.is_visible(locator):
-                    self.scroll_into_view(locator)
-                element = self.driver.find_element(*locator)
-                return element.get_attribute(attribute)
+                def _attribute(element):
+                    if not element.is_displayed():
+                        self.driver.execute_script(
+                            "arguments[0].scrollIntoView();", element
+                        )
+                    return element.get_attribute(attribute)
+
+                return self.with_element(locator, _attribute, timeout)
 
         except TimeoutException:
             LOG.error("failed to find element {}".format(locator[1]))
@@ -576,18 +1019,17 @@ class Label(Browser):
             str: value of the param <attribute> of the param <locator>
         '''
 
+        def _property(element):
+            self.driver.execute_script(
+                "arguments[0].scrollIntoView();", element
+            )
+            return element.get_property(property)
+
         try:
-            self.wait_until_element_present(locator, timeout)
-            self.scroll_into_view(locator)
             if is_multiple_properties:
-                attributes = []
-                elements = self.driver.find_elements(*locator)
-                for element in elements:
-                    attributes.append(element.get_property(property))
-                return attributes
+                return self.read_many(locator, 'prop:' + property, timeout)
             else:
-                element = self.driver.find_element(*locator)
-                return element.get_property(property)
+                return self.with_element(locator, _property, timeout)
 
         except TimeoutException:
             LOG.error("failed to find element {}".format(locator[1]))
@@ -600,7 +1042,8 @@ class Click(Label):
     '''base click class that implments selenium click methods'''
     def button(self, locator, timeout=180):
         '''
-        Clicks on a button
+        Clicks on a button; the click strategy is picked from a single
+        round trip element probe (see probe_element)
         Args:
             locator (webelement): Web element to click.
             timeout (int): timeout in seconds
@@ -609,38 +1052,112 @@ class Click(Label):
         Returns: None
         '''
 
+        probes = [{'present': False}]
+
+        def _clickable(driver):
+            probes[0] = self.probe_element(locator, scroll=True)
+            state = probes[0]
+            return state if state['present'] and state['displayed'] and \
+                state['enabled'] else False
+
+        def _uncovered(driver):
+            state = _clickable(driver)
+            return state if state and not state['obscured'] else False
+
+        def _remaining():
+            return max(0, timeout - (time.monotonic() - start))
+
+        # a missing element gets the implicit wait before the scroll
+        # fallback, only one that is there but not clickable yet gets the
+        # whole timeout
+        start = time.monotonic()
         try:
-            element = None
-            element = self.driver.find_element(*locator)
-            self.AC.reset_actions()
-            self.AC.move_to_element(element).perform()
-            self.wait_until_element_is_clickable(locator, timeout)
+            state = self._wait(min(timeout, self.IMPLICIT_WAIT)).until(
+                _clickable
+            )
+        except TimeoutException:
+            state = None
+
+        if state is None and not probes[0]['present']:
+            # element may only be rendered once it is scrolled to
+            instrumentation.METRICS.event('button', 'scroll_from_top')
+            self._click_missing(locator, _remaining())
+            return
+
+        if state is None:
+            try:
+                state = self._wait(_remaining()).until(_clickable)
+            except TimeoutException:
+                LOG.error("failed to find element {}".format(locator[1]))
+                raise NoSuchElementException
+
+        if state['obscured']:
+            # a native click would land on whatever covers the element,
+            # mostly a toast or an overlay on its way out
+            try:
+                state = self._wait(_remaining()).until(_uncovered)
+            except TimeoutException:
+                element = probes[0].get('element', state['element'])
+                LOG.warning(
+                    "Javascript Button Click on {} as it stays covered".format(
+                        locator[1]
+                    )
+                )
+                self.element_cache.clear()
+                instrumentation.METRICS.event('button', 'js_click')
+                self.driver.execute_script("arguments[0].click();", element)
+                return
+
+        element = state['element']
+
+        # whatever the click does, cached elements can not be trusted after it
+        self.element_cache.clear()
+
+        try:
+            element.click()
+            instrumentation.METRICS.event('button', 'native_click')
+
+        except StaleElementReferenceException:
+            instrumentation.METRICS.event('button', 'stale_retry')
             self.click_after_confirm(locator)
 
-        except TimeoutException:
-            LOG.error("failed to find element {}".format(locator[1]))
-            raise NoSuchElementException
+        except Exception as exception:
+            LOG.info("Javascript Button Click on {} after {}".format(
+                locator[1], exception
+            ))
+            instrumentation.METRICS.event('button', 'js_click')
+            self.driver.execute_script("arguments[0].click();", element)
+
+    def _click_missing(self, locator, timeout):
+        '''
+        Clicks on a button that was not rendered within the implicit wait:
+        searches it from top, then scrolls it into view, then clicks it
+        through javascript if it was found but the clicks failed
+        Args:
+            locator (tuple): web element locator
+            timeout (int): secs left to search for the element
+        Raises:
+            NoSuchElementException
+        '''
+
+        element = None
+        try:
+            element = self.scroll_from_top(locator, timeout=timeout)
+            self.element_cache.clear()
+            self.click_after_confirm(locator)
 
         except Exception:
             try:
-                self.scroll_from_top(locator, timeout=60)
+                self.scroll_into_view(locator)
+                self.element_cache.clear()
                 self.click_after_confirm(locator)
+
             except Exception:
-                try:
-                    self.scroll_into_view(locator)
-                    self.click_after_confirm(locator)
-                except Exception:
-                    if element is not None:
-                        LOG.info("Javascript Button Click on {}".format(element))
-                        try:
-                            self.driver.execute_script(
-                                "arguments[0].click();", element
-                            )
-                        except Exception as exception:
-                            LOG.info(exception)
-                            raise
-                    else:
-                        raise
+                if element is None:
+                    raise
+                LOG.info("Javascript Button Click on {}".format(locator[1]))
+                instrumentation.METRICS.event('button', 'js_click')
+                self.driver.execute_script("arguments[0].click();", element)
 
     def click_after_confirm(self, locator, timeout=60,
                             ignored_exceptions=(NoSuchElementException,
@@ -661,9 +1178,9 @@ class Click(Label):
 
         try:
             ignored_exceptions = ignored_exceptions
-            element = WebDriverWait(self.driver, timeout=timeout,
-                                    ignored_exceptions=ignored_exceptions) \
-                .until(EC.presence_of_element_located(locator))
+            element = self._wait(
+                timeout, ignored_exceptions=ignored_exceptions
+            ).until(EC.presence_of_element_located(locator))
             element.click()
         except Exception as exception:
                     LOG.info(exception)
@@ -689,9 +1206,9 @@ class Click(Label):
 
         try:
             ignored_exceptions = ignored_exceptions
-            element = WebDriverWait(self.driver, timeout=timeout,
-                                    ignored_exceptions=ignored_exceptions) \
-                .until(EC.presence_of_element_located(locator))
+            element = self._wait(
+                timeout, ignored_exceptions=ignored_exceptions
+            ).until(EC.presence_of_element_located(locator))
 
             return element
 
@@ -717,6 +1234,7 @@ class Click(Label):
             self.wait_until_element_present(movetoelement, timeout)
             element = self.driver.find_element(*movetoelement)
             element1 = self.driver.find_element(*locator)
+            self.element_cache.clear()
             self.AC.reset_actions()
             self.AC.move_to_element(element).click(element1).perform()
 
@@ -732,13 +1250,14 @@ class Click(Label):
              desired_state (Boolean): toggles to desired state
         '''
 
-        current_state = self.get_attribute("value", locator) == "true"
-        if current_state != desired_state:
-            LOG.info("changing state - {0} with value - {1}".format(
-                locator, desired_state
-            ))
-            self.scroll_from_top(locator)
-            self.button(locator)
+        with self.element_cache.scope():
+            current_state = self.get_attribute("value", locator) == "true"
+            if current_state != desired_state:
+                LOG.info("changing state - {0} with value - {1}".format(
+                    locator, desired_state
+                ))
+                self.scroll_from_top(locator)
+                self.button(locator)
 
     def toggle_runtime(self, locator, desired_state):
         '''
@@ -748,22 +1267,23 @@ class Click(Label):
              desired_state (Boolean): toggles to desired state
         '''
 
-        current_state = self.get_attribute("class", locator)
-        self.scroll_from_top(locator)
-        if "active" in current_state and not desired_state:
-            self.button(locator)
-        # If the runtime locator has a class with "inactive" appended to it,
-        # click on the button.
-        elif "inactive" in current_state and desired_state:
-            self.button(locator)
-        elif "active" not in current_state and desired_state:
-            self.button(locator)
+        with self.element_cache.scope():
+            current_state = self.get_attribute("class", locator)
+            self.scroll_from_top(locator)
+            if "active" in current_state and not desired_state:
+                self.button(locator)
+            # If the runtime locator has a class with "inactive" appended to
+            # it, click on the button.
+            elif "inactive" in current_state and desired_state:
+                self.button(locator)
+            elif "active" not in current_state and desired_state:
+                self.button(locator)
 
 
 class Input(Click):
     '''base input class that implments selenium input methods'''
 
-    def textbox(self, value, locator, clear=True, timeout=180):
+    def textbox(self, value, locator, clear=True, timeout=180, fast=None):
         '''
         This routine is used to place content in an input box.
         Args:
@@ -771,12 +1291,45 @@ class Input(Click):
             locator (tuple): locator of the input box.
             clear (boolean): Set to True to clear the input box
             timeout (int): timeout in seconds
+            fast (bool): insert the text in one devtools Input.insertText
+                         command instead of typing it key by key, Default:
+                         for text of FAST_INPUT.THRESHOLD chars or more
+                         (env FAST_INPUT_THRESHOLD). An inserted text fires
+                         input events but no key events; text with
+                         selenium Keys is always typed
         '''
 
-        try:
-            self.wait_until_element_present(locator, timeout)
-            self.scroll_into_view(locator)
-            element = self.driver.find_element(*locator)
+        text = value if isinstance(value, str) else str(value)
+        if fast is None:
+            fast = len(text) >= constants.FAST_INPUT.THRESHOLD
+        fast = fast and self._is_plain_text(text) and self.supports_cdp()
+
+        def _insert(element):
+            if clear:
+                element.clear()
+            before = self.driver.execute_script(
+                WD_PF.JS.INPUT_FOCUS, element, clear
+            )
+            if before is None:
+                # not a field with a value, e.g. contenteditable
+                _type(element)
+                return
+
+            expected = text if clear else before + text
+            self.driver.execute("send_command", {
+                'cmd': 'Input.insertText', 'params': {'text': text}
+            })
+            if element.get_attribute('value') == expected:
+                return
+
+            # dropped or partly rejected, e.g. by maxlength or an input mask
+            LOG.debug("inserted text got altered, typing instead")
+            _type(element, True, expected)
+
+        def _type(element, clear=clear, value=value):
+            self.driver.execute_script(
+                "arguments[0].scrollIntoView();", element
+            )
             if clear:
                 element.clear()
 
@@ -785,7 +1338,11 @@ class Input(Click):
                     element.send_keys(Keys.BACK_SPACE)
 
             element.send_keys(value)
-            time.sleep(1)
+
+        try:
+            self.with_element(locator, _insert if fast else _type, timeout)
+            self.element_cache.clear()
+            self.wait_for_settle()
 
         except TimeoutException:
             LOG.error("failed to find element {}".format(locator[1]))
@@ -794,6 +1351,107 @@ class Input(Click):
         except Exception:
             raise
 
+    def fill_form(self, mapping, timeout=180):
+        '''
+        This routine fills a whole form. Consecutive native fields are set in
+        one script: text fields through their native value setter with the
+        input and change events React listens to, selects by option value or
+        visible text, checkboxes and radios by a click when their state
+        differs. Fields that need real keystrokes (special keys, non text
+        inputs) go through textbox, file inputs through fileinput and
+        dropdowns through select. The page is settled once at the end.
+        Args:
+            mapping (dict): locator (tuple) of a field, or label (str) or
+                            (label, index) of a dropdown, to the value to
+                            enter, filled in order. Checkboxes and radios
+                            take a bool or 'true' / 'false'
+            timeout (int): timeout in seconds per field
+        '''
+
+        batch = []
+        for key, value in mapping.items():
+            if isinstance(key, str) or isinstance(key[1], int):
+                label, index = (key, 1) if isinstance(key, str) else key
+                self._fill_fields(batch, timeout)
+                batch = []
+                self.select(label, value, index=index, timeout=timeout)
+                continue
+
+            text = value if isinstance(value, str) else str(value)
+            if not self._is_plain_text(text):
+                # selenium Keys, only a real keystroke does what they mean
+                self._fill_fields(batch, timeout)
+                batch = []
+                self.textbox(value, key, timeout=timeout)
+            else:
+                checked = value if isinstance(value, bool) else \
+                    text.strip().lower() in ('true', '1', 'on', 'yes')
+                batch.append((tuple(key), text, checked))
+
+        self._fill_fields(batch, timeout)
+        self.element_cache.clear()
+        self.wait_for_settle()
+
+    @staticmethod
+    def _is_plain_text(text):
+        '''
+        Returns:
+            bool: False if <text> holds selenium Keys, which live in the
+                  unicode private use area
+        '''
+
+        return not any(u'\ue000' <= char <= u'\uf8ff' for char in text)
+
+    def _fill_fields(self, fields, timeout):
+        '''
+        sets (locator, text, checked) <fields> in one script, handing the
+        ones it can not set to the matching helper
+        '''
+
+        if not fields:
+            return
+
+        locators = [locator for locator, _, _ in fields]
+        try:
+            self.wait_for_all(locators, timeout=timeout)
+        except TimeoutException:
+            raise NoSuchElementException
+
+        try:
+            results = self.driver.execute_script(WD_PF.JS.FILL_FIELDS, [
+                [locator[0], locator[1], text, checked]
+                for locator, text, checked in fields
+            ])
+        except WebDriverException as exception:
+            LOG.debug("batched fill failed, typing instead: {}".format(
+                exception
+            ))
+            results = ['keys'] * len(fields)
+
+        for (locator, text, _), result in zip(fields, results):
+            if result == 'filled':
+                continue
+            LOG.debug("filling {0} one by one ({1})".format(locator[1], result))
+            if result == 'file':
+                self.fileinput(text, locator, timeout=timeout)
+            elif result == 'select':
+                self.with_element(
+                    locator,
+                    lambda element, text=text: Select(
+                        element
+                    ).select_by_visible_text(text),
+                    timeout
+                )
+            elif result == 'click':
+                self.button(locator, timeout=timeout)
+            elif result == 'radio':
+                raise ValueError(
+                    "radio {} can not be unchecked, check another one of its "
+                    "group".format(locator[1])
+                )
+            else:
+                self.textbox(text, locator, timeout=timeout)
+
     def fileinput(self, file_path, locator, timeout=180):
         '''
         This routine is used to perform fiel upload action from local
@@ -802,12 +1460,16 @@ class Input(Click):
             locator (list) : locator of upload button
             timeout (int): timeout in seconds
         '''
-        try:
-            self.wait_until_element_present(locator, timeout)
-            self.scroll_into_view(locator)
-            element = self.driver.find_element(*locator)
+        def _upload(element):
+            self.driver.execute_script(
+                "arguments[0].scrollIntoView();", element
+            )
             element.send_keys(file_path)
-            time.sleep(1)
+
+        try:
+            self.with_element(locator, _upload, timeout)
+            self.element_cache.clear()
+            self.wait_for_settle()
 
         except TimeoutException:
             LOG.error("failed to find element {}".format(locator[1]))
@@ -840,6 +1502,8 @@ class Dropdown(Input):
         '''
 
         try:
+            # a choice can change the options of dependent dropdowns
+            self.option_cache.clear()
             label_locator = set_locator(
                 WD_PF.DROPDOWN.LABEL_XPATH,
                 (drop_down_label, str(index))
@@ -870,7 +1534,7 @@ class Dropdown(Input):
             self.wait_until_element_is_clickable(label_locator, timeout)
             if self.is_element_absent(label_locator):
                 self.scroll_into_view(label_locator)
-            time.sleep(1)
+            self.wait_for_settle()
             self.button(label_locator)
 
             value_locator = set_locator(
@@ -907,6 +1571,7 @@ class Dropdown(Input):
         '''
 
         try:
+            self.option_cache.clear()
             negative_case = False
             if not value_to_select:
                 negative_case = True
@@ -930,7 +1595,7 @@ class Dropdown(Input):
             self.scroll_into_view(label_locator)
             self.wait_until_element_is_clickable(label_locator, timeout)
             self.scroll_into_view(label_locator)
-            time.sleep(1)
+            self.wait_for_settle()
             self.button(label_locator)
             self.textbox(value_to_select, set_locator(
                 WD_PF.DROPDOWN.SELECT_INPUT_XPATH, drop_down_label
@@ -959,6 +1624,7 @@ class Dropdown(Input):
         '''
 
         try:
+            self.option_cache.clear()
             negative_case = False
             if not value_to_select:
                 negative_case = True
@@ -1013,6 +1679,7 @@ class Dropdown(Input):
             timeout (int): timeout in seconds
         '''
         try:
+            self.option_cache.clear()
             self.wait_until_element_visible(label_xpath, timeout)
             self.scroll_into_view(other_element)
             self.button(label_xpath)
@@ -1040,6 +1707,7 @@ class Dropdown(Input):
         '''
 
         try:
+            self.option_cache.clear()
             self.textbox(value_to_select, search_input_box)
             self.button(value_locator)
 
@@ -1050,38 +1718,82 @@ class Dropdown(Input):
         except Exception:
             raise
 
-    def get_all_options(self, drop_down_label, timeout=180):
+    def get_options(self, drop_down_label, timeout=180, index=1,
+                    refresh=False):
         '''
-        This routines returns all the available options from dropdown
+        This routine returns the options of a dropdown with their label,
+        value, disabled flag and index. They are read in one call once the
+        menu is open and reused until the dropdown changes in the page
         Args:
             drop_down_label (str): Label of the dropdown
-            index (int):  index th drop down (with same label) from the page.
             timeout (int): timeout in seconds
+            index (int):  index th drop down (with same label) from the page.
+            refresh (bool): reopen the menu even if cached options are valid
         Returns:
-            list of available options
+            list: dicts with label, value, disabled and index of the options
         '''
+
+        key = (drop_down_label, index)
+        cached = self.option_cache.get(key)
+        if cached is not None and not refresh:
+            try:
+                if self.driver.execute_script(
+                        WD_PF.JS.OPTIONS_VALID, cached['token']):
+                    return [dict(option) for option in cached['options']]
+            except WebDriverException:
+                pass
+
+        arrow_locator = set_locator(
+            WD_PF.DROPDOWN.SELECT_ARROW_NTH_XPATH, (drop_down_label, str(index))
+        )
+        wrapper_locator = set_locator(
+            WD_PF.DROPDOWN.LABEL_XPATH, (drop_down_label, str(index))
+        )
+
         try:
-            label_locator = set_locator(
-                WD_PF.DROPDOWN.SELECT_ARROW_XPATH, drop_down_label
+            self.wait_until_element_present(arrow_locator, timeout)
+            self.wait_until_element_is_clickable(arrow_locator, timeout)
+            self.scroll_into_view(arrow_locator)
+            self.wait_for_settle()
+            self.button(arrow_locator)
+            self.wait_until_element_present(
+                WD_PF.DROPDOWN.SELECT_OPTIONS_XPATH, timeout
             )
 
-            self.wait_until_element_present(label_locator, timeout)
-            self.wait_until_element_is_clickable(label_locator, timeout)
-            self.scroll_into_view(label_locator)
-            time.sleep(1)
-            self.button(label_locator)
-            options_locator = WD_PF.DROPDOWN.SELECT_OPTIONS_XPATH
-            options_text = self.driver.find_element(*options_locator).text
-            options_list = options_text.split("\n")
-            LOG.info("available options: %s" % options_list)
-            return options_list
-
         except TimeoutException:
-            LOG.error("failed to find element {}".format(label_locator[1]))
+            LOG.error("failed to find element {}".format(arrow_locator[1]))
             raise NoSuchElementException
 
-        except Exception:
-            raise
+        token = uuid.uuid4().hex
+        options = self.driver.execute_script(
+            WD_PF.JS.READ_OPTIONS, wrapper_locator[0], wrapper_locator[1],
+            token
+        )
+        if options is None:
+            LOG.error("options menu of {} closed".format(drop_down_label))
+            raise NoSuchElementException
+
+        self.option_cache[key] = {'token': token, 'options': options}
+        return [dict(option) for option in options]
+
+    def get_all_options(self, drop_down_label, timeout=180, index=1):
+        '''
+        This routines returns all the available options from dropdown
+        Args:
+            drop_down_label (str): Label of the dropdown
+            timeout (int): timeout in seconds
+            index (int):  index th drop down (with same label) from the page.
+        Returns:
+            list of available options
+        '''
+
+        options_list = [
+            option['label'] for option in self.get_options(
+                drop_down_label, timeout, index
+            )
+        ]
+        LOG.info("available options: %s" % options_list)
+        return options_list
 
     def select_by_value_locator(
             self, drop_down_label, value_locator, index=1, timeout=180
@@ -1096,6 +1808,7 @@ class Dropdown(Input):
         '''
 
         try:
+            self.option_cache.clear()
             label_locator = set_locator(
                 WD_PF.DROPDOWN.LABEL_XPATH,
                 (drop_down_label, str(index))
@@ -1105,7 +1818,7 @@ class Dropdown(Input):
             self.wait_until_element_is_clickable(label_locator, timeout)
             if self.is_element_absent(label_locator):
                 self.scroll_into_view(label_locator)
-            time.sleep(1)
+            self.wait_for_settle()
             self.button(label_locator)
             if self.is_element_absent(value_locator):
                 self.scroll_into_view(value_locator)
@@ -1128,6 +1841,7 @@ class Dropdown(Input):
         '''
 
         try:
+            self.option_cache.clear()
             index = 1
             self.button(set_locator(
                 WD_PF.DROPDOWN.CLEAR_VALUE_XPATH,
@@ -1156,9 +1870,176 @@ class Selenium(Dropdown):
     # inherits WebDriver, Browser, Wait, Click, Label, Input and Dropdown
     # Wrapper for all selenium capabilities
 
-    def __init__(self):
-        super().__init__()
-        self.login()
+    # cookies and web storage of earlier logins, see constants.AUTH_STATE
+    auth_state = AuthStateStore(
+        constants.AUTH_STATE.PATH, constants.AUTH_STATE.TTL
+    )
+
+    def __init__(self, driver=None, login=True):
+        self.username = None
+        self._injected_username = None
+        self.navigation = NavigationTracker(self)
+        super().__init__(driver)
+        if login and not self.accept_injected_session() and \
+                not self.resume_session():
+            self.login()
+
+    def prepare_session(self):
+        if constants.LOGIN.MODE == 'rest':
+            self.inject_rest_session()
+
+    def inject_rest_session(
+            self,
+            username=constants.CREDS.USERNAME,
+            password=constants.CREDS.DEFAULT_PASSWORD,
+    ):
+        '''
+        Logs in through the REST API and hands the session cookies to the
+        browser; with chrome they are set over devtools before the first page
+        load, other browsers need the app origin loaded first
+        Args:
+            :username(str): Default: CREDS.USERNAME
+            :password(str): Default: CREDS.DEFAULT_PASSWORD
+        Returns:
+            bool: True if session cookies were injected
+        '''
+
+        LOG.info('logging in through REST using username: {}'.format(username))
+        try:
+            rest = REST(username=username, password=password)
+            try:
+                cookies = rest.login_cookies()
+            finally:
+                rest.close()
+        except Exception as exception:
+            LOG.warning('REST login failed: {}'.format(exception))
+            return False
+
+        if not cookies:
+            LOG.warning('REST login returned no session cookies')
+            return False
+
+        url = self.get_url()
+        if not self.supports_cdp():
+            self.navigate(url)
+
+        for cookie in cookies:
+            # the browser scopes the cookie to the app host itself
+            cookie = {key: value for key, value in cookie.items()
+                      if key != 'domain'}
+            try:
+                if self.supports_cdp():
+                    params = dict(cookie, url=url)
+                    if 'expiry' in params:
+                        params['expires'] = params.pop('expiry')
+                    self.driver.execute("send_command", {
+                        'cmd': 'Network.setCookie', 'params': params
+                    })
+                else:
+                    self.driver.add_cookie(cookie)
+            except Exception as exception:
+                LOG.warning('failed to inject cookie {0}: {1}'.format(
+                    cookie['name'], exception
+                ))
+                return False
+
+        self._injected_username = username
+        return True
+
+    def accept_injected_session(self):
+        '''
+        Checks whether the app accepted the cookies of inject_rest_session
+        Returns:
+            bool: True if the app rendered logged in
+        '''
+
+        username, self._injected_username = self._injected_username, None
+        if username is None:
+            return False
+
+        if self.is_logged_in(constants.LOGIN.VERIFY_TIMEOUT):
+            self.username = username
+            self.navigation.mark_clean()
+            LOG.info('login successful using REST session cookies')
+            return True
+
+        LOG.warning('REST session cookies rejected, falling back to UI login')
+        self.driver.delete_all_cookies()
+        return False
+
+    def resume_session(self, username=constants.CREDS.USERNAME):
+        '''
+        Logs in by restoring the saved auth state of an earlier login of
+        <username>; a rejected state is discarded
+        Args:
+            :username(str): Default: CREDS.USERNAME
+        Returns:
+            bool: True if the app accepted the restored state
+        '''
+
+        if not constants.AUTH_STATE.ENABLED:
+            return False
+
+        url = self.get_url()
+        snapshot = self.auth_state.load(url, username)
+        if snapshot is None:
+            return False
+
+        LOG.info('restoring saved auth state of {}'.format(username))
+        try:
+            self.auth_state.restore(self.driver, snapshot)
+            self.navigate(url)
+            if self.is_logged_in(constants.LOGIN.VERIFY_TIMEOUT):
+                self.username = username
+                self.navigation.mark_clean()
+                LOG.info('login successful using saved auth state')
+                return True
+        except Exception as exception:
+            LOG.warning('failed to restore auth state: {}'.format(exception))
+
+        LOG.warning('saved auth state rejected, falling back to UI login')
+        self.auth_state.discard(url, username)
+        try:
+            self.driver.delete_all_cookies()
+            self.driver.execute_script(WD_PF.JS.STORAGE_CLEAR)
+            self.navigate(url)
+        except Exception as exception:
+            LOG.warning('failed to reset the login page: {}'.format(exception))
+        return False
+
+    def save_session(self, username):
+        '''
+        Saves the auth state of the logged in <username> for resume_session
+        Args:
+            :username(str): logged in user
+        '''
+
+        if not constants.AUTH_STATE.ENABLED:
+            return
+        try:
+            self.auth_state.save(
+                self.get_url(), username, self.auth_state.capture(self.driver)
+            )
+        except Exception as exception:
+            LOG.warning('failed to capture auth state: {}'.format(exception))
+
+    def is_logged_in(self, timeout=10):
+        '''
+        Waits for either the app or the login page to render
+        Args:
+            :timeout(int): timeout in seconds
+        Returns:
+            bool: True if the app rendered
+        '''
+
+        try:
+            index, _ = self.wait_for_any(
+                [WD_PF.SELENIUM.SIDE_PANEL, WD_PF.SELENIUM.USERNAME],
+                timeout=timeout
+            )
+        except TimeoutException:
+            return False
+        return index == 0
 
     @retries
     def login(
@@ -1188,6 +2069,8 @@ class Selenium(Dropdown):
             WD_PF.SELENIUM.SIDE_PANEL, timeout=120
         )
         LOG.info('login successful')
+        self.username = username
+        self.save_session(username)
 
         # The side pannel takes time to load
         # LOG.info("expanding side panel")
@@ -1205,7 +2088,8 @@ class Selenium(Dropdown):
         This routine loads the application page
         '''
         try:
-            self.driver.get(self.get_url())
+            self.navigate(self.get_url())
+            self.navigation.mark_clean()
         except (TimeoutException, NoSuchElementException) as e:
             LOG.error(e)
 
@@ -1219,31 +2103,75 @@ class Selenium(Dropdown):
             :Exception: on failure
         '''
         try:
-            self.driver.get(self.get_pcurl() + "/console")
+            self.navigate(self.get_pcurl() + "/console")
         except:
             LOG.info("waiting for /apps page to get opened")
-            try:
-                self.wait_until_element_present(
-                    WD_PF.SELENIUM.SEARCH_INPUT_BOX, timeout=150
-                )
-            except:
-                pass
 
-        self.wait_until_element_present(WD_PF.SELENIUM.ADMIN, timeout=60)
-        self.wait_until_element_is_clickable(WD_PF.SELENIUM.ADMIN)
-        self.button(WD_PF.SELENIUM.ADMIN)
+        # button waits for the user menu to be displayed and enabled itself
+        self.button(WD_PF.SELENIUM.ADMIN, timeout=150)
         self.button(WD_PF.SELENIUM.SIGN_OUT)
-        self.wait_until_element_present(WD_PF.SELENIUM.USERNAME, timeout=60)
-        self.wait_until_element_present(WD_PF.SELENIUM.PASSWORD, timeout=60)
+        # signing out invalidates the saved session server side
+        if self.username is not None:
+            self.auth_state.discard(self.get_url(), self.username)
+            self.username = None
+        self.wait_for_all(
+            [WD_PF.SELENIUM.USERNAME, WD_PF.SELENIUM.PASSWORD], timeout=60
+        )
 
     def script_text(self, locator, code):
-        code_mirror_element = self.driver.find_element(*locator)
-        self.driver.execute_script(
-            WD_PF.SELENIUM.CM_SET_VALUE, code_mirror_element
-        )
-        self.driver.execute_script(
-            WD_PF.SELENIUM.CM_REPLACE_SELECTION, code_mirror_element, code
-        )
+        '''
+        Sets the content of the CodeMirror editor at <locator> to <code>.
+        The code goes over in chunks of FAST_INPUT.CHUNK_SIZE chars and is
+        checked inside the page against its length and hash, once received
+        and once in the editor; a mismatch is retried once.
+        Args:
+            locator (tuple): locator of the CodeMirror element
+            code (str): editor content, line endings are normalized to \\n
+        Raises:
+            RuntimeError: if the editor does not end up holding <code>
+        '''
+
+        code = code.replace('\r\n', '\n').replace('\r', '\n')
+        length, digest = self.text_digest(code)
+        size = constants.FAST_INPUT.CHUNK_SIZE
+        chunks = [
+            code[start:start + size] for start in range(0, len(code), size)
+        ] or ['']
+
+        for _ in range(2):
+            code_mirror_element = self.driver.find_element(*locator)
+            for index, chunk in enumerate(chunks):
+                state = self.driver.execute_script(
+                    WD_PF.JS.CM_TRANSFER, code_mirror_element, chunk, index,
+                    len(chunks), length, digest
+                )
+                if state['done']:
+                    break
+            if state['ok']:
+                return
+            LOG.warning("script text mismatch at {0}: {1} of {2} chars".format(
+                state['stage'], state['length'], length
+            ))
+
+        raise RuntimeError("failed to set script text in {}".format(
+            locator[1]
+        ))
+
+    @staticmethod
+    def text_digest(text):
+        '''
+        Returns:
+            tuple: length and FNV-1a hash of <text> over its utf-16 code
+                   units, the way CM_TRANSFER computes them in the page
+        '''
+
+        units = array.array('H', text.encode('utf-16-le'))
+        if sys.byteorder != 'little':
+            units.byteswap()
+        digest = 0x811c9dc5
+        for unit in units:
+            digest = ((digest ^ unit) * 0x01000193) & 0xffffffff
+        return len(units), digest
 
     def verify_script_text(self, input_script, script_from_ui):
         '''
@@ -1372,6 +2300,12 @@ class Selenium(Dropdown):
         return element.location
 
 
+if instrumentation.ENABLED:
+    instrumentation.instrument(
+        BaseDriver, Wait, Browser, Label, Click, Input, Dropdown, Selenium
+    )
+
+
 class Driver:
     def __init__(self):
         '''
@@ -10,11 +10,13 @@ class DROPDOWN:
     CLEAR_ALL_XPATH = By.XPATH, LABEL_XPATH[1] + CLEAR_ALL
     DROPDOWN_ICON = By.XPATH, "//span[@class='Select-arrow']"
     SELECT_OPTIONS_XPATH = By.XPATH, "//div[@class='Select-menu-outer']"
+    SELECT_OPTION = By.CSS_SELECTOR, ".Select-menu-outer .Select-option"
     SELECT_OPTIONS_VALUE = By.XPATH, "//div[@class='Select-value']"
     SELECT_VALUE_XPATH = By.XPATH, SELECT_OPTIONS_XPATH[1] + "//*[contains(text(), '%s')]"
     SELECT_VALUE = By.XPATH, SELECT_OPTIONS_VALUE[1] + "//*[contains(text(), '%s')]"
     SELECT_ARROW_XPATH = By.XPATH, "//label[text()='%s']//div[@class='Select-control']//span[@class='Select-arrow']"
     SELECT_ARROW_IDX_XPATH = By.XPATH, SELECT_ARROW_XPATH[1]+ "[%s]"
+    SELECT_ARROW_NTH_XPATH = By.XPATH, "(" + SELECT_ARROW_XPATH[1] + ")[%s]"
     SELECT_INPUT_XPATH = By.XPATH, "//label[text()='%s']//div[@class='Select-input']//input"
 
 
@@ -36,3 +38,585 @@ class SELENIUM:
     SUB_HEADER_SPAN = By.XPATH, "(//span[contains(text(), '%s')]/../div[1])[%d]"
     SHOW_PASSWORD_INPUT = By.XPATH, "//button[@class='password-input-show-icon']/../input"
     SHOW_PASSWORD = By.XPATH, "//button[@class='password-input-show-icon']"
+
+
+class JS:
+    # resolves a selenium (by, value) locator to a list of nodes in the page
+    LOCATE = r"""
+    var locate = function (by, value) {
+        var nodes = [], found, i;
+        var all = function (list) { return Array.prototype.slice.call(list); };
+        switch (by) {
+        case 'xpath':
+            found = document.evaluate(value, document, null,
+                XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            for (i = 0; i < found.snapshotLength; i++) {
+                nodes.push(found.snapshotItem(i));
+            }
+            return nodes;
+        case 'id':
+            return all(document.querySelectorAll('[id="' + value.replace(/"/g, '\\"') + '"]'));
+        case 'name':
+            return all(document.getElementsByName(value));
+        case 'tag name':
+            return all(document.getElementsByTagName(value));
+        case 'class name':
+            return all(document.getElementsByClassName(value));
+        case 'css selector':
+            return all(document.querySelectorAll(value));
+        case 'link text':
+        case 'partial link text':
+            return all(document.getElementsByTagName('a')).filter(function (a) {
+                var text = (a.innerText || '').trim();
+                return by === 'link text' ? text === value : text.indexOf(value) !== -1;
+            });
+        }
+        return nodes;
+    };
+    var isDisplayed = function (el) {
+        var node, style, rect;
+        if (!el || !el.isConnected) { return false; }
+        for (node = el; node && node.nodeType === 1; node = node.parentElement) {
+            if (window.getComputedStyle(node).display === 'none') { return false; }
+        }
+        style = window.getComputedStyle(el);
+        if (style.visibility === 'hidden' || style.visibility === 'collapse' ||
+                parseFloat(style.opacity) === 0) {
+            return false;
+        }
+        rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0;
+    };
+    var isEnabled = function (el) {
+        return !el.disabled && !el.closest('fieldset[disabled]');
+    };
+    """
+
+    # arguments: by, value, scroll into view when off screen
+    PROBE_ELEMENT = LOCATE + r"""
+    var el = locate(arguments[0], arguments[1])[0];
+    if (!el) { return {present: false}; }
+    var inViewport = function (rect) {
+        var x = rect.left + rect.width / 2, y = rect.top + rect.height / 2;
+        return x >= 0 && y >= 0 && x < window.innerWidth && y < window.innerHeight;
+    };
+    var rect = el.getBoundingClientRect();
+    if (arguments[2] && !inViewport(rect)) {
+        el.scrollIntoView({block: 'center', inline: 'center'});
+        rect = el.getBoundingClientRect();
+    }
+    var visible = inViewport(rect);
+    var hit = visible ? document.elementFromPoint(
+        rect.left + rect.width / 2, rect.top + rect.height / 2) : null;
+    // a click on the label of a checkbox or radio reaches its control
+    var label = hit && hit.closest ? hit.closest('label') : null;
+    return {
+        present: true,
+        element: el,
+        displayed: isDisplayed(el),
+        enabled: isEnabled(el),
+        in_viewport: visible,
+        obscured: visible && !(hit && (hit === el || el.contains(hit) ||
+            (label && label.control === el))),
+        rect: {x: rect.left, y: rect.top, width: rect.width, height: rect.height}
+    };
+    """
+
+    # arguments: quiet window ms, cap ms, request cutoff ms, async callback
+    # resolves true once no mutation, request or finite animation happened
+    # for the quiet window, false when the cap is hit first. Requests pending
+    # for longer than the cutoff (long polls, streams) are not waited on;
+    # those sent before the first call on the page are not seen at all
+    SETTLE = r"""
+    var quiet = arguments[0], cap = arguments[1], cutoff = arguments[2];
+    var done = arguments[arguments.length - 1];
+    var state = window.__wdSettle;
+    if (!state) {
+        state = window.__wdSettle = {
+            requests: {}, next: 0, lastChange: Date.now()
+        };
+        var touch = function () { state.lastChange = Date.now(); };
+        var track = function () {
+            var id = state.next++;
+            state.requests[id] = Date.now();
+            touch();
+            return function () { delete state.requests[id]; touch(); };
+        };
+        new MutationObserver(touch).observe(document, {
+            childList: true, subtree: true, attributes: true, characterData: true
+        });
+        if (window.fetch) {
+            var fetch = window.fetch;
+            window.fetch = function () {
+                var finish = track();
+                return fetch.apply(this, arguments).then(
+                    function (response) { finish(); return response; },
+                    function (error) { finish(); throw error; });
+            };
+        }
+        var send = XMLHttpRequest.prototype.send;
+        XMLHttpRequest.prototype.send = function () {
+            var finish = track();
+            this.addEventListener('loadend', finish);
+            try {
+                return send.apply(this, arguments);
+            } catch (error) {
+                finish();
+                throw error;
+            }
+        };
+    }
+    var pending = function (now) {
+        return Object.keys(state.requests).some(function (id) {
+            return now - state.requests[id] < cutoff;
+        });
+    };
+    var animating = function () {
+        if (!document.getAnimations) { return false; }
+        return document.getAnimations().some(function (animation) {
+            return animation.playState === 'running' &&
+                animation.effect.getTiming().iterations !== Infinity;
+        });
+    };
+    var frame = document.hidden ? function (callback) {
+        setTimeout(callback, 16);
+    } : window.requestAnimationFrame.bind(window);
+    var start = Date.now();
+    var check = function () {
+        var now = Date.now();
+        if (animating()) { state.lastChange = now; }
+        if (!pending(now) && now - state.lastChange >= quiet) {
+            done(true);
+        } else if (now - start >= cap) {
+            done(false);
+        } else {
+            frame(check);
+        }
+    };
+    frame(check);
+    """
+
+    # arguments: by, value
+    COUNT_ELEMENTS = LOCATE + r"""
+    return locate(arguments[0], arguments[1]).length;
+    """
+
+    # returns localStorage and sessionStorage of the page as plain objects
+    STORAGE_SNAPSHOT = r"""
+    var dump = function (storage) {
+        var items = {};
+        for (var i = 0; i < storage.length; i++) {
+            var key = storage.key(i);
+            items[key] = storage.getItem(key);
+        }
+        return items;
+    };
+    return {local: dump(window.localStorage), session: dump(window.sessionStorage)};
+    """
+
+    # arguments: localStorage items, sessionStorage items
+    STORAGE_RESTORE = r"""
+    var load = function (storage, items) {
+        Object.keys(items || {}).forEach(function (key) {
+            storage.setItem(key, items[key]);
+        });
+    };
+    load(window.localStorage, arguments[0]);
+    load(window.sessionStorage, arguments[1]);
+    """
+
+    STORAGE_CLEAR = r"""
+    window.localStorage.clear();
+    window.sessionStorage.clear();
+    """
+
+    # arguments: token; marks the page as left clean by the navigation
+    # tracker, any user interaction afterwards makes it dirty
+    NAV_MARK = r"""
+    if (!window.__wdNav) {
+        ['input', 'change', 'click', 'keydown', 'submit'].forEach(function (type) {
+            document.addEventListener(type, function () {
+                window.__wdNav.touched = true;
+            }, true);
+        });
+    }
+    window.__wdNav = {token: arguments[0], touched: false};
+    return window.location.href;
+    """
+
+    NAV_FINGERPRINT = r"""
+    var state = window.__wdNav;
+    return {
+        url: window.location.href,
+        token: state ? state.token : null,
+        touched: state ? state.touched : true,
+        ready: document.readyState
+    };
+    """
+
+    # async; arguments: checks [[by, value, condition, text]], mode 'any' or
+    # 'all', slice in ms. Resolves {done, results} as soon as any / all checks
+    # hold or once the slice is over; results holds per check the matched
+    # element, true or false
+    WAIT_FOR = LOCATE + r"""
+    var checks = arguments[0], mode = arguments[1], slice = arguments[2];
+    var done = arguments[arguments.length - 1];
+    var conditions = {
+        present: function (nodes) { return nodes[0] || false; },
+        absent: function (nodes) { return nodes.length === 0; },
+        visible: function (nodes) {
+            return isDisplayed(nodes[0]) ? nodes[0] : false;
+        },
+        invisible: function (nodes) {
+            return nodes.length === 0 || !isDisplayed(nodes[0]);
+        },
+        clickable: function (nodes) {
+            return isDisplayed(nodes[0]) && isEnabled(nodes[0]) ? nodes[0] : false;
+        },
+        text: function (nodes, text) {
+            var el = nodes[0];
+            return !!el && (el.innerText || el.textContent || '').indexOf(text) !== -1;
+        }
+    };
+    var evaluate = function () {
+        var results = checks.map(function (check) {
+            return conditions[check[2]](locate(check[0], check[1]), check[3]);
+        });
+        var met = results.filter(function (result) { return result; }).length;
+        return {
+            done: mode === 'all' ? met === results.length : met > 0,
+            results: results
+        };
+    };
+    var frame = document.hidden ? function (callback) {
+        setTimeout(callback, 16);
+    } : window.requestAnimationFrame.bind(window);
+    var observer, timer, deadline, scheduled = false, finished = false;
+    var finish = function (state) {
+        if (finished) { return; }
+        finished = true;
+        observer.disconnect();
+        clearInterval(timer);
+        clearTimeout(deadline);
+        done(state);
+    };
+    var check = function () {
+        scheduled = false;
+        if (finished) { return; }
+        var state = evaluate();
+        if (state.done) { finish(state); }
+    };
+    var schedule = function () {
+        if (!scheduled) {
+            scheduled = true;
+            frame(check);
+        }
+    };
+    var first = evaluate();
+    if (first.done || slice <= 0) {
+        done(first);
+        return;
+    }
+    observer = new MutationObserver(schedule);
+    observer.observe(document, {
+        childList: true, subtree: true, attributes: true, characterData: true
+    });
+    // styles, layout and transitions change visibility without mutations
+    timer = setInterval(schedule, 100);
+    deadline = setTimeout(function () { finish(evaluate()); }, slice);
+    """
+
+    # async; arguments: by, value, block, inline, scroll container or null,
+    # restart from the top, cap in ms. Pages down the container until the
+    # element is rendered, scrolls it to block / inline and resolves
+    # {found, visible, element} once it is displayed inside every scrollable
+    # ancestor, or at the cap
+    SCROLL_TO = LOCATE + r"""
+    var by = arguments[0], value = arguments[1];
+    var block = arguments[2], inline = arguments[3];
+    var container = arguments[4], restart = arguments[5], cap = arguments[6];
+    var done = arguments[arguments.length - 1];
+    var page = document.scrollingElement || document.documentElement;
+    var scroller = container || page;
+    var isScrollable = function (node) {
+        var style = window.getComputedStyle(node);
+        return /(auto|scroll|overlay)/.test(style.overflowY + ' ' + style.overflowX) &&
+            (node.scrollHeight > node.clientHeight || node.scrollWidth > node.clientWidth);
+    };
+    var inView = function (el) {
+        var rect = el.getBoundingClientRect(), box, node;
+        var x = rect.left + rect.width / 2, y = rect.top + rect.height / 2;
+        if (x < 0 || y < 0 || x > window.innerWidth || y > window.innerHeight) {
+            return false;
+        }
+        for (node = el.parentElement; node && node !== document.body; node = node.parentElement) {
+            if (isScrollable(node)) {
+                box = node.getBoundingClientRect();
+                if (x < box.left || x > box.right || y < box.top || y > box.bottom) {
+                    return false;
+                }
+            }
+        }
+        return true;
+    };
+    var frame = document.hidden ? function (callback) {
+        setTimeout(callback, 16);
+    } : window.requestAnimationFrame.bind(window);
+    var start = Date.now();
+    var step = function () {
+        var el = locate(by, value)[0];
+        if (el) {
+            el.scrollIntoView({block: block, inline: inline});
+            if (isDisplayed(el) && inView(el)) {
+                done({found: true, visible: true, element: el});
+                return;
+            }
+        } else {
+            // a page at a time so lazily rendered rows get their turn
+            var height = scroller === page ? window.innerHeight : scroller.clientHeight;
+            scroller.scrollTop += Math.max(height * 0.8, 250);
+        }
+        if (Date.now() - start >= cap) {
+            done({found: !!el, visible: false, element: el || null});
+            return;
+        }
+        setTimeout(function () { frame(step); }, 30);
+    };
+    if (restart) {
+        scroller.scrollTop = 0;
+    }
+    frame(step);
+    """
+
+    # arguments: by, value, fields. Returns one row per matching element
+    # with the value of every field: 'text', 'attr:<name>' (read like
+    # WebElement.get_attribute), 'prop:<name>' or 'css:<name>'
+    READ_MANY = LOCATE + r"""
+    var fields = arguments[2];
+    var PROPERTIES = ['value', 'href', 'src', 'checked', 'selected', 'disabled',
+                      'readOnly', 'required', 'multiple', 'hidden'];
+    var serialize = function (value) {
+        if (value === undefined) { return null; }
+        if (value !== null && typeof value === 'object' && !(value instanceof Element) &&
+                !Array.isArray(value)) {
+            return String(value);
+        }
+        return value;
+    };
+    var attribute = function (el, name) {
+        var property = name === 'readonly' ? 'readOnly' : name;
+        if (PROPERTIES.indexOf(property) !== -1 && property in el) {
+            var value = el[property];
+            if (typeof value === 'boolean') { return value ? 'true' : null; }
+            return value === null || value === undefined ? null : String(value);
+        }
+        return el.getAttribute(name);
+    };
+    var read = function (el, field) {
+        var split = field.indexOf(':');
+        var kind = split === -1 ? field : field.slice(0, split);
+        var name = field.slice(split + 1);
+        switch (kind) {
+        case 'text':
+            return isDisplayed(el) ? (el.innerText || '').trim() : '';
+        case 'attr':
+            return attribute(el, name);
+        case 'prop':
+            return serialize(el[name]);
+        case 'css':
+            return window.getComputedStyle(el).getPropertyValue(name);
+        }
+        return null;
+    };
+    return locate(arguments[0], arguments[1]).map(function (el) {
+        return fields.map(function (field) { return read(el, field); });
+    });
+    """
+
+    # arguments: by, value of the dropdown wrapper, cache token. Returns the
+    # options of its open menu as {label, value, disabled, index}, closes the
+    # menu and flags the token dirty on any later change of the wrapper that
+    # is not the menu opening or closing
+    READ_OPTIONS = LOCATE + r"""
+    var wrapper = locate(arguments[0], arguments[1])[0], token = arguments[2];
+    var menu = (wrapper && wrapper.querySelector('.Select-menu-outer')) ||
+        document.querySelector('.Select-menu-outer');
+    if (!menu) { return null; }
+    var nodes = menu.querySelectorAll('.Select-option, [role="option"]');
+    if (!nodes.length) {
+        nodes = (menu.querySelector('.Select-menu') || menu).children;
+    }
+    var options = Array.prototype.map.call(nodes, function (node, index) {
+        return {
+            label: node.getAttribute('aria-label') || (node.textContent || '').trim(),
+            value: node.getAttribute('data-value'),
+            disabled: node.classList.contains('is-disabled') ||
+                node.getAttribute('aria-disabled') === 'true',
+            index: index
+        };
+    });
+    // close the menu again, the arrow toggles it
+    var arrow = wrapper && wrapper.querySelector('.Select-arrow-zone');
+    if (arrow && wrapper.querySelector('.Select-menu-outer')) {
+        arrow.dispatchEvent(new MouseEvent('mousedown', {
+            bubbles: true, cancelable: true, button: 0
+        }));
+    }
+    if (document.querySelector('.Select-menu-outer') &&
+            document.activeElement && document.activeElement.blur) {
+        document.activeElement.blur();
+    }
+    if (wrapper) {
+        var registry = window.__wdOptions = window.__wdOptions || {};
+        var state = registry[token] = {el: wrapper, dirty: false};
+        var inMenu = function (node) {
+            var el = node.nodeType === 1 ? node : node.parentElement;
+            return !!el && !!el.closest('.Select-menu-outer');
+        };
+        new MutationObserver(function (records, observer) {
+            var changed = records.some(function (record) {
+                if (inMenu(record.target)) { return false; }
+                if (record.type === 'attributes') {
+                    // opening, focusing and closing toggle the classes of
+                    // the control and the aria state, value and width of
+                    // its search input, none of which changes the options
+                    return !(record.target.closest('.Select-input') ||
+                        (record.attributeName === 'class' &&
+                         record.target.matches('.Select, .Select-control')));
+                }
+                var nodes = Array.prototype.slice.call(record.addedNodes)
+                    .concat(Array.prototype.slice.call(record.removedNodes));
+                return !nodes.length || !nodes.every(inMenu);
+            });
+            if (changed) {
+                state.dirty = true;
+                observer.disconnect();
+            }
+        }).observe(wrapper, {
+            childList: true, subtree: true, attributes: true, characterData: true
+        });
+    }
+    return options;
+    """
+
+    # arguments: cache token. True while the dropdown options read with it
+    # are unchanged
+    OPTIONS_VALID = r"""
+    var state = (window.__wdOptions || {})[arguments[0]];
+    return !!state && !state.dirty && state.el.isConnected;
+    """
+
+    # arguments: fields [[by, value, text, checked]]. Sets the value of every
+    # text field through the native setter and fires input and change, which
+    # React picks up, selects the option of a native select whose value or
+    # else text is <text>, and clicks checkboxes and radios whose checked
+    # state differs from <checked>. Returns per field 'filled', 'missing',
+    # 'file' for file inputs, 'select' for a select without such an option,
+    # 'click' for a check the click did not change, 'radio' for a checked
+    # radio to uncheck or 'keys' for fields that need real keystrokes
+    FILL_FIELDS = LOCATE + r"""
+    var TEXT_TYPES = ['text', 'password', 'email', 'number', 'search', 'tel', 'url',
+                      'date', 'time', 'datetime-local', 'month', 'week', 'color', ''];
+    var setValue = function (el, proto, value) {
+        Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, value);
+        el.dispatchEvent(new Event('input', {bubbles: true}));
+        el.dispatchEvent(new Event('change', {bubbles: true}));
+    };
+    var choose = function (el, text) {
+        var options = Array.prototype.slice.call(el.options);
+        var option = options.filter(function (item) { return item.value === text; })[0] ||
+            options.filter(function (item) { return item.text.trim() === text.trim(); })[0];
+        if (!option) { return 'select'; }
+        el.focus();
+        setValue(el, window.HTMLSelectElement.prototype, option.value);
+        return el.value === option.value ? 'filled' : 'select';
+    };
+    var check = function (el, checked) {
+        if (el.checked === checked) { return 'filled'; }
+        if (el.type === 'radio' && !checked) { return 'radio'; }
+        el.click();
+        return el.checked === checked ? 'filled' : 'click';
+    };
+    var fill = function (el, text, checked) {
+        var tag = el.tagName.toLowerCase(), type = (el.getAttribute('type') || '').toLowerCase(), proto;
+        if (el.disabled || el.readOnly) { return 'keys'; }
+        if (tag === 'input' && el.type === 'file') { return 'file'; }
+        if (tag === 'input' && (el.type === 'checkbox' || el.type === 'radio')) {
+            return check(el, checked);
+        }
+        if (tag === 'select') { return choose(el, text); }
+        if (tag === 'input' && TEXT_TYPES.indexOf(type) !== -1) {
+            proto = window.HTMLInputElement.prototype;
+        } else if (tag === 'textarea') {
+            proto = window.HTMLTextAreaElement.prototype;
+        } else {
+            return 'keys';
+        }
+        el.focus();
+        setValue(el, proto, text);
+        return el.value === text ? 'filled' : 'keys';
+    };
+    var results = arguments[0].map(function (field) {
+        var el = locate(field[0], field[1])[0];
+        return el ? fill(el, field[2], field[3]) : 'missing';
+    });
+    if (document.activeElement && document.activeElement.blur) {
+        document.activeElement.blur();
+    }
+    return results;
+    """
+
+    # arguments: element, select its content
+    # focuses an input for devtools Input.insertText, the caret at the end or
+    # the whole content selected so that the inserted text replaces it.
+    # Returns the value before the insert, null for elements without one
+    INPUT_FOCUS = r"""
+    var el = arguments[0];
+    if (typeof el.value !== 'string') { return null; }
+    el.scrollIntoView();
+    el.focus();
+    try {
+        var length = el.value.length;
+        el.setSelectionRange(arguments[1] ? 0 : length, length);
+    } catch (e) {
+        // input types without a selection, e.g. email or number
+    }
+    return el.value;
+    """
+
+    # arguments: element, chunk, chunk index, chunk count, length, hash
+    # collects the chunks of a text on a CodeMirror element, once the last
+    # one is in checks the joined text against the utf-16 length and FNV-1a
+    # hash computed in python, puts it into the editor and checks its value
+    CM_TRANSFER = r"""
+    var el = arguments[0], index = arguments[2], count = arguments[3];
+    var length = arguments[4], expected = arguments[5];
+    var hash = function (text) {
+        var h = 0x811c9dc5;
+        for (var i = 0; i < text.length; i++) {
+            h = Math.imul(h ^ text.charCodeAt(i), 0x01000193) >>> 0;
+        }
+        return h;
+    };
+    var check = function (stage, text) {
+        var digest = hash(text);
+        return {
+            done: true, stage: stage, length: text.length, hash: digest,
+            ok: text.length === length && digest === expected
+        };
+    };
+    if (index === 0) { el.__wdChunks = []; }
+    if (!el.__wdChunks || el.__wdChunks.length !== index) {
+        return {done: true, ok: false, stage: 'order', length: 0, hash: 0};
+    }
+    el.__wdChunks.push(arguments[1]);
+    if (index < count - 1) { return {done: false, ok: true}; }
+    var text = el.__wdChunks.join('');
+    delete el.__wdChunks;
+    var state = check('transfer', text);
+    if (!state.ok) { return state; }
+    var cm = el.CodeMirror;
+    cm.setValue('');
+    cm.replaceSelection(text, null, '+input');
+    return check('editor', cm.getValue());
+    """